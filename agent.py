@@ -16,28 +16,43 @@ os.environ.setdefault("SSL_CERT_FILE", certifi.where())
 import asyncio
 import json
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import AsyncIterable
+from typing import AsyncIterable, Callable
 
 # Third-party
+import psutil
 from dotenv import load_dotenv
-from livekit import api
+from livekit import api, rtc
 from livekit.agents import (
     Agent,
     AgentSession,
+    FunctionTool,
+    JobContext,
+    JobProcess,
+    JobRequest,
     ModelSettings,
     RunContext,
     WorkerOptions,
     cli,
     function_tool,
     get_job_context,
+    llm,
 )
+from livekit.agents.metrics import LLMMetrics, TTSMetrics
 from livekit.plugins import deepgram, silero
 from livekit.plugins.anthropic import llm as anthropic_llm
 
 # Local
-from scenarios import PatientScenario, SCENARIOS
+import worker_metrics
+from latency import STAGES, format_table, summarize, turn_latencies
+from llm_cache import LLM_CACHE_MODE, LLMResponseCache
+from prompts import PromptCache, PromptTemplate, RenderedPrompt
+from tts_cache import TTS_CACHE_ENABLED, CacheStats, TTSCache
+from scenarios import PatientScenario, SCENARIOS, scenario_from_dict
 
 load_dotenv()
 
@@ -50,14 +65,59 @@ AGENT_NAME = "hospital-patient-bot"
 # Output directories
 RECORDINGS_DIR = Path(__file__).parent / "recordings"
 TRANSCRIPTS_DIR = Path(__file__).parent / "transcripts"
+EVENTS_DIR = Path(__file__).parent / "events"
 RECORDINGS_DIR.mkdir(exist_ok=True)
 TRANSCRIPTS_DIR.mkdir(exist_ok=True)
+EVENTS_DIR.mkdir(exist_ok=True)
+
+# Call lifecycle events, read by the dispatcher's completion tracker
+CALL_EVENTS_PATH = Path(os.getenv("CALL_EVENTS_PATH", EVENTS_DIR / "call_events.jsonl"))
+
+# Transcript writes are batched off the event loop. A flush starts every
+# TRANSCRIPT_FLUSH_INTERVAL seconds or once TRANSCRIPT_MAX_PENDING lines are
+# queued; a crash loses the lines queued since the last flush finished (more
+# than TRANSCRIPT_MAX_PENDING if the disk is slow). Lines written after the
+# transcript is closed are dropped with a warning.
+TRANSCRIPT_FLUSH_INTERVAL = 0.5
+TRANSCRIPT_MAX_PENDING = 20
+
+# How long the opening line waits for egress to start before playing anyway
+EGRESS_READY_TIMEOUT = 2.0
+
+# Worker capacity: LiveKit stops routing jobs here above WORKER_LOAD_THRESHOLD,
+# and jobs offered beyond WORKER_MAX_CALLS are declined
+WORKER_MAX_CALLS = int(os.getenv("WORKER_MAX_CALLS", "8"))
+WORKER_LOAD_THRESHOLD = float(os.getenv("WORKER_LOAD_THRESHOLD", "0.9"))
+LOOP_LAG_LIMIT = 0.1  # Seconds of event-loop lag that count as fully loaded
+CLAIM_TIMEOUT = 30.0  # Seconds an accepted job may take to show up as active
+
+# Longest hang_up waits for the goodbye to finish playing
+HANGUP_PLAYOUT_TIMEOUT = 10.0
+
+# Bound on stopping egress and finalizing the transcript when a job shuts down
+SHUTDOWN_TIMEOUT = 10.0
+
+# Watchdog limits in seconds, counted from the call being answered. Silence is
+# no final transcript and no VAD activity; hold is VAD activity without transcripts.
+CALL_MAX_DURATION = float(os.getenv("CALL_MAX_DURATION", "600"))
+CALL_MAX_SILENCE = float(os.getenv("CALL_MAX_SILENCE", "60"))
+CALL_MAX_HOLD = float(os.getenv("CALL_MAX_HOLD", "300"))
+WATCHDOG_INTERVAL = 1.0
 
 # Model configuration
 STT_MODEL = "nova-2"
 LLM_MODEL = "claude-sonnet-4-20250514"
 TTS_MODEL = "aura-asteria-en"
 
+# Anthropic prompt caching for the system prompt and stable conversation prefix
+LLM_PROMPT_CACHING = os.getenv("LLM_PROMPT_CACHING", "1") != "0"
+
+# Record/replay of LLM responses (see llm_cache.py)
+LLM_CACHE = LLMResponseCache(LLM_CACHE_MODE, model=LLM_MODEL)
+
+# Synthesized patient sentences, reused across calls (see tts_cache.py)
+TTS_CACHE = TTSCache(TTS_MODEL) if TTS_CACHE_ENABLED else None
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -85,57 +145,267 @@ Guidelines:
 
 Begin by stating why you're calling."""
 
+PATIENT_TEMPLATE = PromptTemplate(PATIENT_PROMPT)
+PROMPTS = PromptCache()
+
+
+def patient_prompt(scenario: PatientScenario) -> RenderedPrompt:
+    """The agent instructions for a scenario, rendered once per process."""
+    return PROMPTS.render(PATIENT_TEMPLATE, scenario)
+
+# Prompt for the opening line, which is prepared while the call rings
+OPENING_INSTRUCTIONS = "State why you're calling."
+
+# =============================================================================
+# Call Lifecycle Events
+# =============================================================================
+
+
+def emit_call_event(room_name: str, event: str, **fields):
+    """Append a lifecycle event (dispatched, joined, sip_connected, ...) for a call."""
+    record = {"ts": time.time(), "room": room_name, "event": event, **fields}
+    try:
+        # Single small O_APPEND writes stay whole across worker processes
+        with open(CALL_EVENTS_PATH, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        logger.warning(f"Could not write call event: {e}")
+    logger.info(f"Call event: {event} ({room_name})")
+
+
+# =============================================================================
+# Transcript Writer
+# =============================================================================
+
+
+class TranscriptWriter:
+    """Queues transcript lines in memory and appends them to disk in batches.
+
+    A background task flushes on a timer, or early once enough lines are
+    pending. The file I/O runs in a thread so it never blocks the audio loop.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = TRANSCRIPT_FLUSH_INTERVAL,
+        max_pending: int = TRANSCRIPT_MAX_PENDING,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: list[str] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()  # Keeps batches in order
+        self._task: asyncio.Task | None = None
+        self._closed = False  # Background task stopping
+        self._finished = False  # Final flush done; later lines have nowhere to go
+
+    def write(self, line: str):
+        """Queue a line for the next flush. Lines after aclose() are dropped."""
+        if self._finished:
+            logger.warning(f"Dropped line written after {self.path.name} was closed: {line[:80]}")
+            return
+        self._pending.append(line)
+        if self._task is None and not self._closed:
+            self._task = asyncio.create_task(self._run())
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write all pending lines to disk."""
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        async with self._lock:
+            await asyncio.to_thread(self._write_lines, lines)
+
+    async def aclose(self):
+        """Stop the background task and flush what is left."""
+        self._closed = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+        await self.flush()
+        self._finished = True
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.warning(f"Could not write transcript: {e}")
+
+    def _write_lines(self, lines: list[str]):
+        with open(self.path, "a") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+
 # =============================================================================
 # Call Recorder (LiveKit Egress)
 # =============================================================================
 
 
+@dataclass
+class TurnTiming:
+    """Monotonic timestamps for one turn of the STT -> LLM -> TTS pipeline."""
+    stt_final: float | None = None  # Hospital final transcript that prompted the turn
+    llm_first_token: float | None = None
+    tts_first_byte: float | None = None
+    text: str | None = None  # Set once the reply text is complete
+    audio_done: bool = False
+    logged: bool = False
+
+
 class CallRecorder:
-    """Records call audio and transcripts using LiveKit Egress."""
+    """Records call audio and transcripts using LiveKit Egress.
+
+    Each call gets a human-readable .txt transcript and a line-delimited
+    .jsonl transcript with millisecond timings relative to the call start.
+    """
 
-    def __init__(self, scenario_name: str, room_name: str):
+    def __init__(
+        self,
+        scenario_name: str,
+        room_name: str,
+        transcripts_dir: Path = TRANSCRIPTS_DIR,
+        recordings_dir: Path = RECORDINGS_DIR,
+        prompt_fingerprint: str | None = None,
+    ):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         safe_name = scenario_name.replace(" ", "_").lower()
         self.base_name = f"{timestamp}_{safe_name}"
+        # Calls for the same scenario can start within the same second
+        suffix = 1
+        while (transcripts_dir / f"{self.base_name}.txt").exists():
+            suffix += 1
+            self.base_name = f"{timestamp}_{safe_name}_{suffix}"
         self.room_name = room_name
         self.scenario_name = scenario_name
+        self.prompt_fingerprint = prompt_fingerprint
 
         # File paths
-        self.audio_path = RECORDINGS_DIR / f"{self.base_name}.ogg"
-        self.transcript_path = TRANSCRIPTS_DIR / f"{self.base_name}.txt"
+        self.audio_path = recordings_dir / f"{self.base_name}.ogg"
+        self.transcript_path = transcripts_dir / f"{self.base_name}.txt"
+        self.json_path = transcripts_dir / f"{self.base_name}.jsonl"
 
         # State
         self.egress_id: str | None = None
-        self.transcript_entries: list[str] = []
+        self.recording_ready = asyncio.Event()  # Set once egress has started or failed
+        self.audio_started: float | None = None  # Monotonic time the recording begins
+        self.first_entry: float | None = None
+        self.last_entry: float | None = None
+        self.end_reason: str | None = None
+        self._recording: asyncio.Task | None = None
+        self._finalized = False
+        self.entry_count = 0
+        self.started = time.monotonic()
+        self.latencies: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self.llm_cache_hits = 0
+        self.llm_requests = 0
+        self.tts_cache = CacheStats()
 
         # Write transcript header
         self._init_transcript()
+        self.writer = TranscriptWriter(self.transcript_path)
+        self.json_writer = TranscriptWriter(self.json_path)
 
     def _init_transcript(self):
-        """Initialize transcript file with header."""
+        """Initialize transcript files with headers."""
+        started = datetime.now().isoformat()
         with open(self.transcript_path, "w") as f:
             f.write(f"Call Transcript: {self.scenario_name}\n")
             f.write(f"Room: {self.room_name}\n")
-            f.write(f"Started: {datetime.now().isoformat()}\n")
+            f.write(f"Started: {started}\n")
             f.write(f"Audio: {self.audio_path.name}\n")
+            if self.prompt_fingerprint:
+                f.write(f"Prompt: {self.prompt_fingerprint}\n")
             f.write("-" * 50 + "\n")
+        with open(self.json_path, "w") as f:
+            f.write(json.dumps({
+                "type": "header",
+                "scenario": self.scenario_name,
+                "room": self.room_name,
+                "started": started,
+                "audio": self.audio_path.name,
+                "prompt_fingerprint": self.prompt_fingerprint,
+            }) + "\n")
+
+    def _ms(self, t: float | None) -> int | None:
+        """Milliseconds from call start for a monotonic timestamp."""
+        return None if t is None else round((t - self.started) * 1000)
 
-    def _append_transcript(self, speaker: str, text: str):
-        """Append a line to the transcript."""
+    def _append_transcript(self, speaker: str, text: str, timing: TurnTiming):
+        """Append an entry to both transcripts."""
         timestamp = datetime.now().strftime("%H:%M:%S")
         line = f"[{timestamp}] {speaker}: {text}"
-        self.transcript_entries.append(line)
-        with open(self.transcript_path, "a") as f:
-            f.write(line + "\n")
+        now = time.monotonic()
+        entry = {
+            "type": "entry",
+            "t_ms": self._ms(now),
+            "speaker": speaker.strip(),
+            "text": text,
+            "stt_final_ms": self._ms(timing.stt_final),
+            "llm_first_token_ms": self._ms(timing.llm_first_token),
+            "tts_first_byte_ms": self._ms(timing.tts_first_byte),
+            "scenario": self.scenario_name,
+            "room": self.room_name,
+        }
+        self.entry_count += 1
+        if self.first_entry is None:
+            self.first_entry = now
+        self.last_entry = now
+        self.writer.write(line)
+        self.json_writer.write(json.dumps(entry))
         logger.info(f"{speaker}: {text}")
 
-    def log_hospital(self, text: str):
+        if entry["speaker"] == "PATIENT":
+            turn = turn_latencies(entry)
+            for stage, value in turn.items():
+                self.latencies[stage].append(value)
+                worker_metrics.TURN_LATENCY.observe(value, stage=stage)
+            if "turnaround" in turn:
+                logger.info(
+                    "Turn latency: "
+                    + ", ".join(f"{STAGES[stage]} {value}ms" for stage, value in turn.items())
+                )
+
+    def log_hospital(self, text: str, stt_final: float | None = None):
         """Log hospital system speech."""
-        self._append_transcript("HOSPITAL", text)
+        self._append_transcript("HOSPITAL", text, TurnTiming(stt_final=stt_final))
 
-    def log_patient(self, text: str):
+    def log_patient(self, text: str, timing: TurnTiming | None = None):
         """Log patient bot speech."""
-        self._append_transcript("PATIENT ", text)
+        self._append_transcript("PATIENT ", text, timing or TurnTiming())
+
+    def log_llm_request(self, ttft: float, prompt_tokens: int, cached_tokens: int):
+        """Record prompt-cache usage and time to first token for one LLM request."""
+        hit = cached_tokens > 0
+        self.llm_requests += 1
+        self.llm_cache_hits += hit
+        self.json_writer.write(json.dumps({
+            "type": "llm",
+            "t_ms": self._ms(time.monotonic()),
+            "ttft_ms": round(ttft * 1000),
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "cache_hit": hit,
+            "room": self.room_name,
+        }))
+        logger.info(
+            f"LLM: ttft {ttft * 1000:.0f}ms, prompt {prompt_tokens} tokens "
+            f"({cached_tokens} cached, {'hit' if hit else 'miss'})"
+        )
+
+    def start_recording_task(self, lk_api: api.LiveKitAPI) -> asyncio.Task:
+        """Start recording in the background; `recording_ready` is set when it settles."""
+        self._recording = asyncio.create_task(self.start_recording(lk_api))
+        return self._recording
 
     async def start_recording(self, lk_api: api.LiveKitAPI):
         """Start LiveKit Egress audio recording."""
@@ -154,27 +424,88 @@ class CallRecorder:
 
             response = await lk_api.egress.start_room_composite_egress(egress_request)
             self.egress_id = response.egress_id
+            self.audio_started = time.monotonic()
+            if response.started_at:
+                # Egress reports its own start in wall-clock nanoseconds
+                self.audio_started -= time.time() - response.started_at / 1e9
+            self.json_writer.write(json.dumps({
+                "type": "audio",
+                "t_ms": self._ms(self.audio_started),
+                "egress_id": self.egress_id,
+                "room": self.room_name,
+            }))
             logger.info(f"Recording started: {self.audio_path.name} (egress: {self.egress_id})")
 
         except Exception as e:
+            worker_metrics.EGRESS_FAILURES.inc()
             logger.warning(f"Could not start recording: {e}")
             logger.info("Continuing without audio recording")
 
+        finally:
+            self.recording_ready.set()
+
+    def audio_offset_ms(self) -> int | None:
+        """Milliseconds from the start of the recording to the first transcript entry."""
+        if self.audio_started is None or self.first_entry is None:
+            return None
+        return round((self.first_entry - self.audio_started) * 1000)
+
     async def stop_recording(self, lk_api: api.LiveKitAPI):
-        """Stop the egress recording."""
-        if self.egress_id:
+        """Stop the egress recording, waiting for it to finish starting if need be."""
+        if self._recording:
+            await self._recording
+        egress_id, self.egress_id = self.egress_id, None
+        if egress_id:
             try:
-                await lk_api.egress.stop_egress(api.StopEgressRequest(egress_id=self.egress_id))
+                await lk_api.egress.stop_egress(api.StopEgressRequest(egress_id=egress_id))
                 logger.info(f"Recording stopped: {self.audio_path.name}")
             except Exception as e:
                 logger.warning(f"Could not stop recording: {e}")
 
-    def finalize(self):
-        """Finalize transcript with footer."""
-        with open(self.transcript_path, "a") as f:
-            f.write("-" * 50 + "\n")
-            f.write(f"Ended: {datetime.now().isoformat()}\n")
-            f.write(f"Entries: {len(self.transcript_entries)}\n")
+    async def close(self, lk_api: api.LiveKitAPI):
+        """Stop egress and finalize the transcript concurrently."""
+        await asyncio.gather(self.stop_recording(lk_api), self.finalize())
+
+    async def finalize(self):
+        """Flush pending transcript lines and write the footers, once."""
+        if self._finalized:
+            return
+        self._finalized = True
+        ended = datetime.now().isoformat()
+        self.writer.write("-" * 50)
+        self.writer.write(f"Ended: {ended}")
+        self.writer.write(f"Entries: {self.entry_count}")
+        if self.end_reason:
+            self.writer.write(f"End reason: {self.end_reason}")
+        for line in format_table(self.latencies):
+            self.writer.write(line)
+        audio_offset = self.audio_offset_ms()
+        if audio_offset is not None:
+            self.writer.write(f"First entry at {audio_offset / 1000:.2f}s into the recording")
+        if self.llm_requests:
+            self.writer.write(
+                f"LLM prompt cache: {self.llm_cache_hits}/{self.llm_requests} requests hit"
+            )
+        tts_total = self.tts_cache.hits + self.tts_cache.misses
+        if tts_total:
+            self.writer.write(
+                f"TTS cache: {self.tts_cache.hits}/{tts_total} sentences hit "
+                f"({self.tts_cache.hit_rate:.0%})"
+            )
+        self.json_writer.write(json.dumps({
+            "type": "footer",
+            "ended": ended,
+            "duration_ms": self._ms(time.monotonic()),
+            "entries": self.entry_count,
+            "end_reason": self.end_reason,
+            "audio_offset_ms": audio_offset,
+            "latency": {stage: summarize(values) for stage, values in self.latencies.items()},
+            "llm_cache": {"hits": self.llm_cache_hits, "requests": self.llm_requests},
+            "tts_cache": {"hits": self.tts_cache.hits, "misses": self.tts_cache.misses},
+        }))
+        worker_metrics.TTS_CACHE.inc(self.tts_cache.hits, result="hit")
+        worker_metrics.TTS_CACHE.inc(self.tts_cache.misses, result="miss")
+        await asyncio.gather(self.writer.aclose(), self.json_writer.aclose())
         logger.info(f"Transcript saved: {self.transcript_path}")
         if self.audio_path.exists():
             logger.info(f"Audio saved: {self.audio_path}")
@@ -185,32 +516,65 @@ class CallRecorder:
 # =============================================================================
 
 
+def _chunk_text(chunk) -> str:
+    """Text content of an LLM stream chunk (plain str or ChatChunk)."""
+    if isinstance(chunk, str):
+        return chunk
+    delta = getattr(chunk, "delta", None)
+    return (delta.content or "") if delta else ""
+
+
+async def _iterate(items: list) -> AsyncIterable:
+    for item in items:
+        yield item
+
+
 class PatientAgent(Agent):
     """Voice agent simulating a patient calling a hospital."""
 
-    def __init__(self, scenario: PatientScenario, recorder: CallRecorder):
+    def __init__(
+        self,
+        scenario: PatientScenario,
+        recorder: CallRecorder,
+        job_start: float | None = None,
+        vad_prewarmed: bool = False,
+    ):
         instructions = self._build_instructions(scenario)
         super().__init__(instructions=instructions)
         self.scenario = scenario
         self.recorder = recorder
 
+        # Startup timing (monotonic)
+        self.job_start = job_start if job_start is not None else time.monotonic()
+        self.vad_prewarmed = vad_prewarmed
+        self.first_audio_at: float | None = None
+
+        # Per-turn timing: set by hospital speech, picked up by llm_node/tts_node
+        self._pending_stt_final: float | None = None
+        self._turn: TurnTiming | None = None
+        self._ended = False
+
     def _build_instructions(self, scenario: PatientScenario) -> str:
         """Build the agent instructions from scenario."""
-        details = ""
-        if scenario.details:
-            details = "Details:\n" + "\n".join(
-                f"- {k}: {v}" for k, v in scenario.details.items()
-            )
+        return patient_prompt(scenario).text
 
-        return PATIENT_PROMPT.format(
-            name=scenario.name,
-            dob=scenario.date_of_birth,
-            goal=scenario.goal,
-            details=details,
-        )
+    def on_hospital_final(self, text: str):
+        """Record a final hospital transcript; it starts the timing of our next turn."""
+        self._pending_stt_final = time.monotonic()
+        self.recorder.log_hospital(text, stt_final=self._pending_stt_final)
+
+    def _log_turn(self, turn: TurnTiming):
+        """Log the patient's reply once its text is complete and audio has started."""
+        if turn.logged or turn.text is None:
+            return
+        if turn.tts_first_byte is None and not turn.audio_done:
+            return
+        turn.logged = True
+        if turn.text:
+            self.recorder.log_patient(turn.text, turn)
 
     async def _capture_text_stream(
-        self, text_stream: AsyncIterable[str]
+        self, text_stream: AsyncIterable[str], turn: TurnTiming
     ) -> AsyncIterable[str]:
         """Wrap text stream to capture output for transcript."""
         buffer: list[str] = []
@@ -218,38 +582,388 @@ class PatientAgent(Agent):
             buffer.append(chunk)
             yield chunk
 
-        if buffer:
-            full_text = "".join(buffer).strip()
-            if full_text:
-                self.recorder.log_patient(full_text)
+        turn.text = "".join(buffer).strip()
+        self._log_turn(turn)
+
+    async def prepare_opening(self) -> tuple[str, list[rtc.AudioFrame]]:
+        """Generate and synthesize the opening line, e.g. while the call is ringing."""
+        chat_ctx = llm.ChatContext()
+        chat_ctx.add_message(role="system", content=self.instructions)
+        chat_ctx.add_message(role="user", content=OPENING_INSTRUCTIONS)
+        stream = LLM_CACHE.wrap(
+            self.scenario, chat_ctx, lambda: self.session.llm.chat(chat_ctx=chat_ctx)
+        )
+        text = "".join([_chunk_text(chunk) async for chunk in stream]).strip()
+
+        if TTS_CACHE:
+            audio = TTS_CACHE.synthesize(
+                _iterate([text]), self.session.tts, self.recorder.tts_cache
+            )
+            frames = [frame async for frame in audio]
+        else:
+            async with self.session.tts.synthesize(text) as synthesis:
+                frames = [event.frame async for event in synthesis]
+        return text, frames
+
+    def play_opening(self, text: str, frames: list[rtc.AudioFrame], answered_at: float):
+        """Play a prepared opening line and record answer-to-first-audio latency."""
+        turn = TurnTiming(text=text)
+
+        async def audio() -> AsyncIterable[rtc.AudioFrame]:
+            async for frame in self._time_audio(_iterate(frames), turn):
+                if frame is frames[0]:
+                    latency = turn.tts_first_byte - answered_at
+                    worker_metrics.ANSWER_TO_AUDIO.observe(latency)
+                    logger.info(f"Answer to first audio: {latency * 1000:.0f}ms")
+                yield frame
+
+        return self.session.say(text, audio=audio())
+
+    async def _time_audio(self, audio: AsyncIterable, turn: TurnTiming) -> AsyncIterable:
+        """Mark the turn's first audio frame and log job-start-to-first-audio once."""
+        try:
+            async for frame in audio:
+                if turn.tts_first_byte is None:
+                    turn.tts_first_byte = time.monotonic()
+                    self._log_turn(turn)
+
+                if self.first_audio_at is None:
+                    self.first_audio_at = turn.tts_first_byte
+                    vad = "prewarmed" if self.vad_prewarmed else "loaded per job"
+                    logger.info(
+                        f"Job start to first audio: {self.first_audio_at - self.job_start:.2f}s "
+                        f"(VAD {vad})"
+                    )
+                yield frame
+        finally:
+            turn.audio_done = True
+            self._log_turn(turn)
+
+    def timed_llm(self, stream: AsyncIterable) -> AsyncIterable:
+        """Start a new turn and time the first token of an LLM stream."""
+        # Created eagerly: the TTS side may be set up before the stream is consumed
+        turn = TurnTiming(stt_final=self._pending_stt_final)
+        self._pending_stt_final = None
+        self._turn = turn
+        return self._time_llm(stream, turn)
+
+    async def _time_llm(self, stream: AsyncIterable, turn: TurnTiming) -> AsyncIterable:
+        async for chunk in stream:
+            if turn.llm_first_token is None and _chunk_text(chunk):
+                turn.llm_first_token = time.monotonic()
+            yield chunk
+
+    def timed_tts(
+        self,
+        text: AsyncIterable[str],
+        synthesize: Callable[[AsyncIterable[str]], AsyncIterable],
+    ) -> AsyncIterable:
+        """Capture reply text for the transcript and time its synthesized audio."""
+        # Replies without an LLM turn (e.g. session.say) get a fresh timing record
+        turn, self._turn = self._turn or TurnTiming(), None
+        captured_text = self._capture_text_stream(text, turn)
+        return self._time_audio(synthesize(captured_text), turn)
+
+    def llm_node(
+        self,
+        chat_ctx: llm.ChatContext,
+        tools: list[FunctionTool],
+        model_settings: ModelSettings,
+    ) -> AsyncIterable:
+        """Hook into the LLM pipeline to time the first token of each reply."""
+        stream = LLM_CACHE.wrap(
+            self.scenario,
+            chat_ctx,
+            lambda: Agent.default.llm_node(self, chat_ctx, tools, model_settings),
+        )
+        return self.timed_llm(stream)
 
     def tts_node(
         self, text: AsyncIterable[str], model_settings: ModelSettings
     ) -> AsyncIterable:
         """Hook into TTS pipeline to capture agent speech."""
-        captured_text = self._capture_text_stream(text)
-        return Agent.default.tts_node(self, captured_text, model_settings)
+        if TTS_CACHE:
+            return self.timed_tts(
+                text,
+                lambda captured: TTS_CACHE.synthesize(
+                    captured, self.session.tts, self.recorder.tts_cache,
+                    stream=lambda rest: Agent.default.tts_node(self, rest, model_settings),
+                ),
+            )
+        return self.timed_tts(
+            text, lambda captured: Agent.default.tts_node(self, captured, model_settings)
+        )
+
+    async def end_call(self, reason: str):
+        """Stop egress, delete the room and shut the job down, once.
+
+        The job's shutdown callbacks then finalize the transcript.
+        """
+        if self._ended:
+            return
+        self._ended = True
+        self.recorder.end_reason = reason
+        try:
+            ctx = get_job_context()
+        except RuntimeError:  # Outside a job, e.g. in simulate.py
+            ctx = None
+        if ctx is None:
+            await self.recorder.finalize()
+            return
+
+        # Stopped before the room goes so the recording ends cleanly. Both API calls
+        # are bounded; a stop that times out carries on in the background
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self.recorder.stop_recording(ctx.api)), SHUTDOWN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Recording did not stop within {SHUTDOWN_TIMEOUT}s")
+        try:
+            # Deleting the room hangs up the SIP leg and frees the trunk channel
+            await asyncio.wait_for(
+                ctx.api.room.delete_room(api.DeleteRoomRequest(room=ctx.room.name)),
+                SHUTDOWN_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Room was not deleted within {SHUTDOWN_TIMEOUT}s")
+        except Exception as e:
+            logger.warning(f"Could not delete room: {e}")
+        ctx.shutdown(reason=reason)
 
     @function_tool
-    async def hang_up(self) -> str:
+    async def hang_up(self, context: RunContext) -> str:
         """End the call when the conversation is complete."""
         logger.info("Ending call")
-        ctx = get_job_context()
-        if ctx:
-            await asyncio.sleep(1.0)
-            await ctx.api.room.delete_room(
-                api.DeleteRoomRequest(room=ctx.room.name)
-            )
+        emit_call_event(self.recorder.room_name, "hung_up")
+        try:
+            # Let the goodbye finish playing before the line drops
+            await asyncio.wait_for(context.wait_for_playout(), HANGUP_PLAYOUT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Goodbye still playing after {HANGUP_PLAYOUT_TIMEOUT}s, hanging up")
+        await self.end_call("hung_up")
         return "Call ended."
 
 
+# =============================================================================
+# Call Watchdog
+# =============================================================================
+
+
+class CallWatchdog:
+    """Ends calls that run too long, go silent, or sit on hold.
+
+    Hold is VAD activity on the hospital side (e.g. music) with no final
+    transcript. It has its own, longer limit than plain silence.
+    """
+
+    def __init__(
+        self,
+        agent: PatientAgent,
+        max_duration: float = CALL_MAX_DURATION,
+        max_silence: float = CALL_MAX_SILENCE,
+        max_hold: float = CALL_MAX_HOLD,
+    ):
+        self.agent = agent
+        self.max_duration = max_duration
+        self.max_silence = max_silence
+        self.max_hold = max_hold
+        self.started = time.monotonic()
+        self.vad_active = False
+        self.last_vad = self.started
+        self.hold_start: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def on_user_state(self, state: str):
+        """Track VAD activity from the session's user_state_changed events."""
+        now = time.monotonic()
+        self.vad_active = state == "speaking"
+        self.last_vad = now
+        if self.vad_active and self.hold_start is None:
+            self.hold_start = now
+
+    def check(self, now: float) -> str | None:
+        """Name of the limit that has been exceeded, if any."""
+        last_entry = max(self.agent.recorder.last_entry or 0.0, self.started)
+        if self.hold_start is not None and self.hold_start < last_entry:
+            # Someone spoke since the activity began, so it wasn't hold
+            self.hold_start = last_entry if self.vad_active else None
+        if self.vad_active:
+            self.last_vad = now
+
+        if now - self.started > self.max_duration:
+            return "max_duration"
+        if self.hold_start is not None and now - self.hold_start > self.max_hold:
+            return "hold"
+        if now - max(last_entry, self.last_vad) > self.max_silence:
+            return "silence"
+        return None
+
+    def start(self):
+        self.started = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(WATCHDOG_INTERVAL)
+            reason = self.check(time.monotonic())
+            if reason:
+                break
+        logger.warning(f"Watchdog ending call: {reason}")
+        emit_call_event(self.agent.recorder.room_name, "watchdog", reason=reason)
+        worker_metrics.WATCHDOG_ENDS.inc(reason=reason)
+        await self.agent.end_call(f"watchdog:{reason}")
+
+
+# =============================================================================
+# Worker Capacity
+# =============================================================================
+
+
+def worker_load(
+    active_calls: int, cpu: float, loop_lag: float, max_calls: int = WORKER_MAX_CALLS
+) -> float:
+    """Load from 0 to 1: the most saturated of call slots, CPU and event-loop lag."""
+    return min(1.0, max(active_calls / max_calls, cpu, loop_lag / LOOP_LAG_LIMIT))
+
+
+class WorkerCapacity:
+    """Reports worker load to LiveKit and admits jobs while there is room.
+
+    Accepted jobs take a moment to appear in the worker's active jobs, so each
+    admission is held as a claim until it does (or CLAIM_TIMEOUT passes).
+    `load_fnc` runs in an executor thread, so claims are guarded by a lock.
+    """
+
+    def __init__(
+        self, max_calls: int = WORKER_MAX_CALLS, threshold: float = WORKER_LOAD_THRESHOLD
+    ):
+        self.max_calls = max_calls
+        self.threshold = threshold
+        self.running = 0
+        self.load = 0.0
+        self.declined = 0
+        self._claims: dict[str, float] = {}  # Job id -> monotonic claim time
+        self._lock = threading.Lock()
+
+    @property
+    def active_calls(self) -> int:
+        return self.running + len(self._claims)
+
+    def update(
+        self, active_jobs: list[str], cpu: float, loop_lag: float, now: float | None = None
+    ) -> float:
+        """Recompute load from the running job ids; claims that started or expired are dropped."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            started = set(active_jobs)
+            self._claims = {
+                job_id: claimed_at
+                for job_id, claimed_at in self._claims.items()
+                if job_id not in started and now - claimed_at < CLAIM_TIMEOUT
+            }
+            self.running = len(started)
+            self.load = worker_load(self.active_calls, cpu, loop_lag, self.max_calls)
+            return self.load
+
+    def try_admit(self, job_id: str) -> bool:
+        """Claim a call slot for `job_id`. The claim counts until the job is running."""
+        with self._lock:
+            if self.active_calls >= self.max_calls or self.load >= self.threshold:
+                self.declined += 1
+                return False
+            self._claims[job_id] = time.monotonic()
+            return True
+
+    def release(self, job_id: str):
+        """Drop a claim whose job will not run."""
+        with self._lock:
+            self._claims.pop(job_id, None)
+
+    def load_fnc(self, worker) -> float:
+        """WorkerOptions.load_fnc, called periodically in the main worker process.
+
+        `worker` is the Worker (AgentServer from livekit-agents 1.3 on); only
+        its `active_jobs` is used.
+        """
+        # Job processes report their event-loop lag through the metrics snapshots
+        lag = worker_metrics.gauge_value(worker_metrics.LOOP_LAG_MAX.name)
+        job_ids = [info.job.id for info in worker.active_jobs]
+        return self.update(job_ids, psutil.cpu_percent() / 100, lag)
+
+    async def request_fnc(self, req: JobRequest):
+        """WorkerOptions.request_fnc: decline jobs once the worker is full."""
+        if self.try_admit(req.id):
+            try:
+                await req.accept()
+            except BaseException:
+                self.release(req.id)
+                raise
+            return
+        logger.warning(
+            f"Declining job {req.id}: {self.active_calls}/{self.max_calls} calls, "
+            f"load {self.load:.2f}"
+        )
+        await req.reject()
+
+
 # =============================================================================
 # Entrypoint
 # =============================================================================
 
 
-async def entrypoint(ctx: RunContext):
+def prewarm(proc: JobProcess):
+    """Load the VAD model and scenario indexes once per worker process."""
+    start = time.monotonic()
+    proc.userdata["vad"] = silero.VAD.load()
+    logger.info(f"Prewarmed Silero VAD in {time.monotonic() - start:.2f}s")
+    # A large SCENARIO_CORPUS is indexed on first use; do it before any call
+    start = time.monotonic()
+    count = len(SCENARIOS)
+    logger.info(f"Indexed {count} scenarios in {time.monotonic() - start:.2f}s")
+    worker_metrics.start_snapshots()
+
+
+async def entrypoint(ctx: JobContext):
     """Agent entrypoint - handles outbound calls to hospital phone systems."""
+    call_start = time.monotonic()
+
+    # Room info from the job is available before the room is connected
+    room_name = ctx.job.room.name
+    emit_call_event(room_name, "dispatched", job_id=ctx.job.id)
+
+    worker_metrics.start_snapshots()
+    worker_metrics.watch_event_loop()
+    worker_metrics.CALLS_STARTED.inc()
+    worker_metrics.ACTIVE_CALLS.inc()
+
+    recorder: CallRecorder | None = None
+    watchdog: CallWatchdog | None = None
+
+    async def on_shutdown():
+        """Runs however the job ends: stop egress, flush the transcript, write the footer."""
+        if watchdog:
+            watchdog.stop()
+        try:
+            if recorder:
+                await asyncio.wait_for(recorder.close(ctx.api), SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Recorder did not close within {SHUTDOWN_TIMEOUT}s")
+        except Exception as e:
+            logger.error(f"Could not close recorder: {e}")
+        finally:
+            worker_metrics.ACTIVE_CALLS.dec()
+            # The job process exits after this; don't lose the last second of metrics
+            await asyncio.to_thread(worker_metrics.write_snapshot)
+            emit_call_event(
+                room_name, "finalized", duration=round(time.monotonic() - call_start, 3)
+            )
+
+    ctx.add_shutdown_callback(on_shutdown)
 
     # Parse job metadata
     metadata = json.loads(ctx.job.metadata) if ctx.job.metadata else {}
@@ -257,38 +971,87 @@ async def entrypoint(ctx: RunContext):
     phone_number = metadata.get("phone_number")
     sip_trunk_id = metadata.get("sip_trunk_id")
 
-    # Validate scenario
-    if scenario_index >= len(SCENARIOS):
-        logger.error(f"Invalid scenario index: {scenario_index}")
+    # Look up the scenario; the stable ID guards against a dispatcher with another corpus.
+    # Generated scenarios come whole in the metadata.
+    if "scenario" in metadata:
+        scenario = scenario_from_dict(metadata["scenario"])
+    elif "scenario_id" in metadata:
+        scenario = SCENARIOS.by_id(metadata["scenario_id"])
+    elif 0 <= scenario_index < len(SCENARIOS):
+        scenario = SCENARIOS[scenario_index]
+    else:
+        scenario = None
+    if scenario is None:
+        logger.error(f"Invalid scenario: {metadata.get('scenario_id', scenario_index)}")
+        worker_metrics.CALLS_FAILED.inc(reason="invalid_scenario")
         return
 
-    scenario = SCENARIOS[scenario_index]
     logger.info(f"Scenario: {scenario.name} | Goal: {scenario.goal}")
 
     # Initialize recorder (handles both audio and transcripts)
-    recorder = CallRecorder(scenario.name, ctx.room.name)
+    recorder = CallRecorder(
+        scenario.name, room_name, prompt_fingerprint=patient_prompt(scenario).fingerprint
+    )
+
+    # VAD comes from prewarm; load it here only if the process wasn't prewarmed
+    vad = ctx.proc.userdata.get("vad")
+    vad_prewarmed = vad is not None
+    if not vad_prewarmed:
+        load_start = time.monotonic()
+        vad = silero.VAD.load()
+        logger.info(f"Loaded Silero VAD for this job in {time.monotonic() - load_start:.2f}s")
 
     # Create agent and session
-    agent = PatientAgent(scenario, recorder)
+    agent = PatientAgent(scenario, recorder, job_start=call_start, vad_prewarmed=vad_prewarmed)
     session = AgentSession(
         stt=deepgram.STT(model=STT_MODEL),
-        llm=anthropic_llm.LLM(model=LLM_MODEL),
+        llm=anthropic_llm.LLM(
+            model=LLM_MODEL,
+            caching="ephemeral" if LLM_PROMPT_CACHING else None,
+        ),
         tts=deepgram.TTS(model=TTS_MODEL),
-        vad=silero.VAD.load(),
+        vad=vad,
     )
 
+    watchdog = CallWatchdog(agent)
+
     # Capture hospital speech
     @session.on("user_input_transcribed")
     def on_hospital_speech(event):
         if event.is_final:
-            recorder.log_hospital(event.transcript)
+            agent.on_hospital_final(event.transcript)
+
+    # VAD activity on the hospital side, for hold detection
+    @session.on("user_state_changed")
+    def on_hospital_state(event):
+        watchdog.on_user_state(event.new_state)
+
+    # Token and character usage for the metrics endpoint
+    @session.on("metrics_collected")
+    def on_metrics(event):
+        if isinstance(event.metrics, LLMMetrics):
+            cached = getattr(event.metrics, "prompt_cached_tokens", 0) or 0
+            worker_metrics.LLM_TOKENS.inc(event.metrics.prompt_tokens, direction="in")
+            worker_metrics.LLM_TOKENS.inc(event.metrics.completion_tokens, direction="out")
+            worker_metrics.LLM_CACHED_TOKENS.inc(cached)
+            worker_metrics.LLM_TTFT.observe(event.metrics.ttft)
+            recorder.log_llm_request(event.metrics.ttft, event.metrics.prompt_tokens, cached)
+        elif isinstance(event.metrics, TTSMetrics):
+            worker_metrics.TTS_CHARACTERS.inc(event.metrics.characters_count)
 
     # Start session
     await session.start(room=ctx.room, agent=agent)
+    emit_call_event(room_name, "joined")
+
+    # Record from the moment the room exists, and prepare the opening line while the call rings
+    recorder.start_recording_task(ctx.api)
+    opening = asyncio.create_task(agent.prepare_opening())
 
     # Place outbound call
+    answered_at = time.monotonic()  # Without a phone number the room is "answered" now
     if phone_number and sip_trunk_id:
         logger.info(f"Calling {phone_number}")
+        dial_start = time.monotonic()
         try:
             await ctx.api.sip.create_sip_participant(
                 api.CreateSIPParticipantRequest(
@@ -299,19 +1062,39 @@ async def entrypoint(ctx: RunContext):
                     wait_until_answered=True,
                 )
             )
+            answered_at = time.monotonic()
             logger.info("Connected")
-
-            # Start audio recording after call connects
-            await recorder.start_recording(ctx.api)
+            worker_metrics.SIP_CONNECT_TIME.observe(answered_at - dial_start)
+            emit_call_event(room_name, "sip_connected")
 
         except api.TwirpError as e:
-            logger.error(f"Call failed: {e.message}")
-            recorder.finalize()
-            await ctx.shutdown()
+            opening.cancel()
+            sip_status = e.metadata.get("sip_status_code", "unknown")
+            logger.error(f"Call failed: {e.message} (SIP {sip_status})")
+            emit_call_event(room_name, "sip_failed", sip_status=sip_status)
+            worker_metrics.CALLS_FAILED.inc(reason="sip")
+            recorder.end_reason = "sip_failed"
+            ctx.shutdown(reason="sip_failed")
             return
 
-    # Begin conversation
-    await session.generate_reply(instructions="State why you're calling.")
+    watchdog.start()
+
+    # Begin conversation, falling back to a live reply if preparation failed
+    try:
+        text, frames = await opening
+    except Exception as e:
+        logger.warning(f"Could not prepare opening line: {e}")
+        text, frames = "", []
+
+    # Give a slow egress a moment so the opening line is on the recording
+    try:
+        await asyncio.wait_for(recorder.recording_ready.wait(), EGRESS_READY_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Recording not ready after {EGRESS_READY_TIMEOUT}s, starting anyway")
+    if frames:
+        await agent.play_opening(text, frames, answered_at)
+    else:
+        await session.generate_reply(instructions=OPENING_INSTRUCTIONS)
 
 
 # =============================================================================
@@ -319,9 +1102,15 @@ async def entrypoint(ctx: RunContext):
 # =============================================================================
 
 if __name__ == "__main__":
+    worker_metrics.serve()
+    capacity = WorkerCapacity()
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            request_fnc=capacity.request_fnc,
+            load_fnc=capacity.load_fnc,
+            load_threshold=WORKER_LOAD_THRESHOLD,
             agent_name=AGENT_NAME,
         )
     )
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: pooled vs per-call LiveKit API clients.
+
+Dispatches against a local stub Twirp server, so the numbers show client-side
+overhead only (session and connection setup, no TLS or network latency).
+
+Usage:
+    python benchmarks/bench_dispatch_client.py
+    python benchmarks/bench_dispatch_client.py -c 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import web
+from livekit import api
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dispatch import AGENT_NAME, DispatchClient  # noqa: E402
+
+API_KEY = "devkey"
+API_SECRET = "devsecret-devsecret-devsecret-devsecret"
+
+
+async def create_dispatch(request: web.Request) -> web.Response:
+    """Stub for livekit.AgentDispatchService/CreateDispatch."""
+    req = api.CreateAgentDispatchRequest.FromString(await request.read())
+    dispatch = api.AgentDispatch(id="AD_stub", agent_name=req.agent_name, room=req.room)
+    return web.Response(body=dispatch.SerializeToString(), content_type="application/protobuf")
+
+
+async def start_stub_server() -> tuple[web.AppRunner, str]:
+    """Start the stub Twirp server on a free localhost port."""
+    app = web.Application()
+    app.router.add_post("/twirp/livekit.AgentDispatchService/CreateDispatch", create_dispatch)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def dispatch_request(n: int) -> api.CreateAgentDispatchRequest:
+    return api.CreateAgentDispatchRequest(agent_name=AGENT_NAME, room=f"bench-{n}", metadata="{}")
+
+
+async def bench_per_call(url: str, count: int) -> list[float]:
+    """One LiveKitAPI per dispatch, as dispatch_call used to do."""
+    latencies = []
+    for n in range(count):
+        start = time.perf_counter()
+        lk = api.LiveKitAPI(url=url, api_key=API_KEY, api_secret=API_SECRET)
+        try:
+            await lk.agent_dispatch.create_dispatch(dispatch_request(n))
+        finally:
+            await lk.aclose()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def bench_pooled(url: str, count: int) -> list[float]:
+    """One shared DispatchClient for every dispatch."""
+    latencies = []
+    async with DispatchClient(url, API_KEY, API_SECRET) as client:
+        for n in range(count):
+            start = time.perf_counter()
+            await client.api.agent_dispatch.create_dispatch(dispatch_request(n))
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label: str, latencies: list[float]):
+    ms = sorted(x * 1000 for x in latencies)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{label:<10} avg {statistics.mean(ms):6.2f}ms  "
+        f"p50 {statistics.median(ms):6.2f}ms  p95 {p95:6.2f}ms"
+    )
+
+
+async def main(count: int):
+    runner, url = await start_stub_server()
+    try:
+        # Warm up the server side before measuring
+        await bench_pooled(url, 10)
+        per_call = await bench_per_call(url, count)
+        pooled = await bench_pooled(url, count)
+    finally:
+        await runner.cleanup()
+
+    print(f"{count} dispatches against {url}")
+    report("per-call", per_call)
+    report("pooled", pooled)
+    print(f"Speed-up: {statistics.mean(per_call) / statistics.mean(pooled):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call API clients")
+    parser.add_argument("-c", "--count", type=int, default=200, help="Dispatches per client mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.count))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory per scenario for a loaded corpus.
+
+Parses a synthetic JSONL corpus the way a worker loads one (every string
+is a fresh object) and measures traced allocations per scenario for the
+old plain dataclass with a dict of details and for the slotted
+PatientScenario with interned fields.
+
+Usage:
+    python benchmarks/bench_scenario_memory.py
+    python benchmarks/bench_scenario_memory.py --counts 10000 100000
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scenario_generator import FIRST_NAMES, LAST_NAMES, TEMPLATES, random_dob  # noqa: E402
+from scenarios import scenario_from_dict  # noqa: E402
+
+
+@dataclass
+class LegacyScenario:
+    """The original PatientScenario."""
+    name: str
+    date_of_birth: str
+    scenario_type: str
+    goal: str
+    details: dict = field(default_factory=dict)
+
+
+def corpus_lines(count: int, seed: int = 0):
+    """JSONL records drawn from the generator's templates, without de-duplication."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        keys = rng.sample(sorted(template.details), rng.randint(1, len(template.details)))
+        yield json.dumps({
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "date_of_birth": random_dob(rng),
+            "scenario_type": template.scenario_type,
+            "goal": rng.choice(template.goals),
+            "details": {key: rng.choice(template.details[key]) for key in keys},
+        })
+
+
+def load_legacy(record: dict) -> LegacyScenario:
+    return LegacyScenario(
+        record["name"], record["date_of_birth"], record["scenario_type"], record["goal"],
+        record.get("details") or {},
+    )
+
+
+def measure(lines: list[str], build) -> tuple[float, float]:
+    """Bytes per scenario still allocated after loading, and load time in seconds."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    scenarios = [build(json.loads(line)) for line in lines]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del scenarios
+    return used / len(lines), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[100_000, 1_000_000], help="Corpus sizes"
+    )
+    args = parser.parse_args()
+
+    print(f"{'Scenarios':>10}{'legacy B/each':>16}{'slotted B/each':>16}{'saved':>8}"
+          f"{'legacy load':>13}{'slotted load':>14}")
+    for count in args.counts:
+        lines = list(corpus_lines(count))
+        legacy, legacy_time = measure(lines, load_legacy)
+        slotted, slotted_time = measure(lines, scenario_from_dict)
+        print(
+            f"{count:>10}{legacy:>16.0f}{slotted:>16.0f}{1 - slotted / legacy:>8.0%}"
+            f"{legacy_time:>12.2f}s{slotted_time:>13.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import and lookup time for a large scenario corpus.
+
+Builds a synthetic corpus and compares two ways of shipping it:
+a Python module with a hard-coded list (the old SCENARIOS) that
+get_scenario scans linearly, and a JSONL file behind ScenarioRegistry.
+
+Usage:
+    python benchmarks/bench_scenarios.py
+    python benchmarks/bench_scenarios.py --count 20000 --lookups 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scenarios import BUILTIN_SCENARIOS, ScenarioRegistry, scenario_id  # noqa: E402
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def make_records(count: int) -> list[dict]:
+    """Built-in scenarios with numbered patient names."""
+    records = []
+    for i in range(count):
+        base = BUILTIN_SCENARIOS[i % len(BUILTIN_SCENARIOS)]
+        records.append({**base.to_dict(), "name": f"{base.name} {i}"})
+    return records
+
+
+def write_corpus(records: list[dict], out_dir: Path) -> tuple[Path, Path]:
+    jsonl = out_dir / "corpus.jsonl"
+    with open(jsonl, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+    module = out_dir / "scenarios_literal.py"
+    with open(module, "w") as f:
+        f.write("from scenarios import PatientScenario\n\nSCENARIOS = [\n")
+        for r in records:
+            f.write(
+                f"    PatientScenario(name={r['name']!r}, date_of_birth={r['date_of_birth']!r}, "
+                f"scenario_type={r['scenario_type']!r}, goal={r['goal']!r}, "
+                f"details={r['details']!r}),\n"
+            )
+        f.write("]\n")
+    return jsonl, module
+
+
+def import_time(module: str, out_dir: Path, env: dict | None = None) -> float:
+    """Seconds to import `module` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+        cwd=out_dir,
+        env={**os.environ, "PYTHONPATH": f"{out_dir}{os.pathsep}{ROOT}", **(env or {})},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def per_lookup_us(fn, keys: list) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def linear_get(scenarios: list, name: str):
+    """The old get_scenario."""
+    for s in scenarios:
+        if s.name.lower() == name.lower():
+            return s
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000, help="Scenarios in the corpus")
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    records = make_records(args.count)
+    names = [records[rng.randrange(args.count)]["name"].lower() for _ in range(args.lookups)]
+    indices = [rng.randrange(args.count) for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        jsonl, _ = write_corpus(records, out_dir)
+        print(f"Corpus: {args.count} scenarios, {jsonl.stat().st_size / 1e6:.1f} MB JSONL")
+
+        # Import: the first literal import pays for compiling the .pyc
+        import_time("scenarios_literal", out_dir)
+        literal_import = import_time("scenarios_literal", out_dir)
+        registry_import = import_time("scenarios", out_dir, {"SCENARIO_CORPUS": str(jsonl)})
+
+        # Lookups
+        sys.path.insert(0, str(out_dir))
+        import scenarios_literal
+
+        literal = scenarios_literal.SCENARIOS
+        registry = ScenarioRegistry(paths=[jsonl])
+        start = time.perf_counter()
+        len(registry)
+        index_build = time.perf_counter() - start
+        ids = [scenario_id(registry[i]) for i in indices]
+
+        print(f"\n{'':28}{'literal list':>14}{'registry':>14}")
+        print(f"{'Import (ms)':28}{literal_import * 1000:>14.1f}{registry_import * 1000:>14.1f}")
+        print(f"{'Index on first use (ms)':28}{'-':>14}{index_build * 1000:>14.1f}")
+        print(
+            f"{'By position (us)':28}"
+            f"{per_lookup_us(literal.__getitem__, indices):>14.2f}"
+            f"{per_lookup_us(registry.__getitem__, indices):>14.2f}"
+        )
+        print(
+            f"{'By name (us)':28}"
+            f"{per_lookup_us(lambda n: linear_get(literal, n), names):>14.1f}"
+            f"{per_lookup_us(registry.by_name, names):>14.2f}"
+        )
+        print(f"{'By stable ID (us)':28}{'-':>14}{per_lookup_us(registry.by_id, ids):>14.2f}")
+        print(
+            f"{'Count by type (us)':28}"
+            f"{per_lookup_us(lambda t: sum(s.scenario_type == t for s in literal), ['refill']):>14.1f}"
+            f"{per_lookup_us(registry.count_of_type, ['refill'] * args.lookups):>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event-loop lag with synchronous vs buffered transcript writes.
+
+Simulates many concurrent calls appending utterances while a probe task
+measures how late the event loop wakes up. The synchronous writer is the
+old CallRecorder behaviour: open, append and close the file per line.
+
+On a fast local disk each write takes microseconds, and the thread hop
+makes the buffered writer no better, sometimes worse. --io-delay adds a
+fixed delay to every write to stand in for slow storage (network volumes,
+a disk busy with recordings), which is the case the buffered writer is for.
+
+Usage:
+    python benchmarks/bench_transcript_writer.py
+    python benchmarks/bench_transcript_writer.py --calls 500 --lines 100
+    python benchmarks/bench_transcript_writer.py --calls 50 --io-delay 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent import TranscriptWriter  # noqa: E402
+
+PROBE_INTERVAL = 0.005  # Seconds between event-loop lag samples
+LINE = "[14:16:59] PATIENT : Yes, this is Michael Thompson, my date of birth is March 22, 1985."
+
+
+class SyncWriter:
+    """The original per-line writer."""
+
+    def __init__(self, path: Path, io_delay: float = 0.0):
+        self.path = path
+        self.io_delay = io_delay
+
+    def write(self, line: str):
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
+        time.sleep(self.io_delay)
+
+    async def aclose(self):
+        pass
+
+
+class SlowTranscriptWriter(TranscriptWriter):
+    """TranscriptWriter whose batch writes take an extra `io_delay` seconds."""
+
+    def __init__(self, path: Path, io_delay: float = 0.0):
+        super().__init__(path)
+        self.io_delay = io_delay
+
+    def _write_lines(self, lines: list[str]):
+        super()._write_lines(lines)
+        time.sleep(self.io_delay)
+
+
+async def probe_lag(samples: list[float], stop: asyncio.Event):
+    """Record how far past its deadline each wake-up lands."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def simulate_call(writer, lines: int, gap: float):
+    for _ in range(lines):
+        writer.write(LINE)
+        await asyncio.sleep(gap)
+    await writer.aclose()
+
+
+async def run(make_writer, out_dir: Path, calls: int, lines: int, gap: float) -> list[float]:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(samples, stop))
+    writers = [make_writer(out_dir / f"call_{n}.txt") for n in range(calls)]
+    await asyncio.gather(*(simulate_call(w, lines, gap) for w in writers))
+    stop.set()
+    await probe
+    return samples
+
+
+def report(label: str, samples: list[float]):
+    ms = sorted(x * 1000 for x in samples)
+    p99 = ms[int(len(ms) * 0.99) - 1]
+    print(
+        f"{label:<9} lag avg {statistics.mean(ms):6.2f}ms  "
+        f"p99 {p99:6.2f}ms  max {ms[-1]:6.2f}ms"
+    )
+
+
+async def main(calls: int, lines: int, gap: float, io_delay: float):
+    with tempfile.TemporaryDirectory() as sync_dir, tempfile.TemporaryDirectory() as buf_dir:
+        sync = await run(
+            lambda path: SyncWriter(path, io_delay), Path(sync_dir), calls, lines, gap
+        )
+        buffered = await run(
+            lambda path: SlowTranscriptWriter(path, io_delay), Path(buf_dir), calls, lines, gap
+        )
+
+    print(
+        f"{calls} calls x {lines} lines, one line per call every {gap * 1000:.0f}ms, "
+        f"{io_delay * 1000:g}ms added per write"
+    )
+    report("sync", sync)
+    report("buffered", buffered)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark transcript writer event-loop lag")
+    parser.add_argument("--calls", type=int, default=200, help="Concurrent simulated calls")
+    parser.add_argument("--lines", type=int, default=50, help="Lines per call")
+    parser.add_argument("--gap", type=float, default=0.02, help="Seconds between lines per call")
+    parser.add_argument(
+        "--io-delay", type=float, default=0.0, metavar="MS",
+        help="Milliseconds added to every file write, to simulate slow storage",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.lines, args.gap, args.io_delay / 1000))
@@ -0,0 +1,97 @@
+"""
+Size-bounded on-disk key/value store with LRU eviction.
+
+Values are stored one file per key. Recency is tracked in memory and
+persisted through file mtimes, so a restarted process picks up where the
+last one left off. Several processes may share a directory: writes are
+atomic renames and each process evicts based on what it has seen.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+class DiskLRUStore:
+    """Bytes values on disk, evicting least recently used entries past `max_bytes`."""
+
+    def __init__(self, directory: Path, max_bytes: int, suffix: str = ".bin"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._total = 0
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total += size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    @property
+    def size(self) -> int:
+        """Total bytes stored, as seen by this process."""
+        return self._total
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value for `key`, marking it most recently used."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                if key in self._sizes:
+                    self._total -= self._sizes.pop(key)
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key not in self._sizes:
+                # Written by another process
+                self._sizes[key] = len(data)
+                self._total += len(data)
+            self._sizes.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store `data` under `key`, evicting old entries to stay within budget."""
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+        with self._lock:
+            self._total += len(data) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(data)
+            evicted = []
+            while self._total > self.max_bytes and len(self._sizes) > 1:
+                old_key, old_size = self._sizes.popitem(last=False)
+                self._total -= old_size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            self._path(old_key).unlink(missing_ok=True)
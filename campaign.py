@@ -0,0 +1,198 @@
+"""
+Campaign manifests for scheduled test-call runs.
+
+A campaign describes a whole run: how many calls to place, the mix of
+scenario types, which numbers to call, pacing limits and a time window.
+Manifests are JSON or YAML:
+
+    name: nightly
+    total: 500
+    seed: 7
+    weights: {scheduling: 3, rescheduling: 1, canceling: 1, refill: 2, question: 1}
+    numbers: ["+18054398008", "+18054398009"]
+    limits: {max_calls: 10, rate: 0.5, burst: 2, retries: 2}
+    start: "2026-10-20T22:00:00"   # Optional, defaults to launch
+    deadline: "6h"                 # Duration from start, clock time ("06:00") or ISO datetime
+
+Calls are streamed lazily from the scenario generator, so a campaign of any
+size costs the same memory. Numbers are assigned round-robin.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, time as clock_time, timedelta
+from itertools import cycle
+from pathlib import Path
+from typing import Iterator
+
+from scenario_generator import TEMPLATES, generate_scenarios
+from scenarios import PatientScenario
+
+MANIFEST_KEYS = {"name", "total", "seed", "weights", "numbers", "limits", "start", "deadline"}
+LIMIT_KEYS = ("max_calls", "rate", "burst", "retries")
+DURATION = re.compile(r"^\s*(?:(\d+)h)?\s*(?:(\d+)m)?\s*(?:(\d+)s)?\s*$")
+
+
+@dataclass(frozen=True)
+class CampaignCall:
+    """One work item: a scenario and the number to call with it."""
+    scenario: PatientScenario
+    phone_number: str
+
+
+@dataclass(frozen=True)
+class Campaign:
+    """A parsed campaign manifest."""
+    name: str
+    total: int
+    weights: dict[str, float]
+    numbers: tuple[str, ...]
+    seed: int = 0
+    limits: dict[str, float] = field(default_factory=dict)  # Subset of LIMIT_KEYS
+    start: datetime | None = None
+    deadline: datetime | None = None
+
+    def targets(self) -> dict[str, int]:
+        """Planned calls per scenario type (largest remainder, sums to total)."""
+        total_weight = sum(self.weights.values())
+        shares = {t: self.total * w / total_weight for t, w in self.weights.items()}
+        targets = {t: int(share) for t, share in shares.items()}
+        by_remainder = sorted(shares, key=lambda t: shares[t] - targets[t], reverse=True)
+        for scenario_type in by_remainder[: self.total - sum(targets.values())]:
+            targets[scenario_type] += 1
+        return targets
+
+    def calls(self) -> Iterator[CampaignCall]:
+        """Lazy stream of the campaign's calls."""
+        numbers = cycle(self.numbers)
+        scenarios = generate_scenarios(self.total, self.seed, self.weights)
+        for scenario in scenarios:
+            yield CampaignCall(scenario, next(numbers))
+
+
+def parse_duration(text: str) -> timedelta | None:
+    """`"6h"`, `"90m"`, `"1h30m"` or `"45s"`; None if `text` is not a duration."""
+    match = DURATION.match(text)
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def parse_time(value, key: str, after: datetime) -> datetime:
+    """A manifest time: duration from `after`, next clock time after it, or ISO datetime."""
+    if isinstance(value, datetime):  # YAML parses unquoted timestamps itself
+        parsed = value
+    elif not isinstance(value, str):
+        raise ValueError(f"{key} must be a quoted string, got {value!r}")
+    elif duration := parse_duration(value):
+        return after + duration
+    else:
+        try:
+            at = clock_time.fromisoformat(value)
+        except ValueError:
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid {key}: {value!r}") from None
+        else:
+            parsed = datetime.combine(after.date(), at, tzinfo=after.tzinfo)
+            if parsed <= after:
+                parsed += timedelta(days=1)
+            return parsed
+    # Naive datetimes are local time
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def campaign_from_dict(data: dict, default_number: str) -> Campaign:
+    """Validate a manifest mapping. Raises ValueError on a bad manifest."""
+    unknown = data.keys() - MANIFEST_KEYS
+    if unknown:
+        raise ValueError(f"Unknown campaign keys: {', '.join(sorted(unknown))}")
+
+    total = data.get("total")
+    if not _is_int(total) or total < 1:
+        raise ValueError("total must be a positive integer")
+    seed = data.get("seed", 0)
+    if not _is_int(seed):
+        raise ValueError(f"seed must be an integer, got {seed!r}")
+
+    known_types = {t.scenario_type for t in TEMPLATES}
+    weights = data.get("weights") or dict.fromkeys(known_types, 1)
+    if not isinstance(weights, dict) or not all(_is_number(w) for w in weights.values()):
+        raise ValueError("weights must map scenario types to numbers")
+    weights = {t: float(w) for t, w in weights.items()}
+    bad_types = weights.keys() - known_types
+    if bad_types:
+        raise ValueError(f"Unknown scenario types: {', '.join(sorted(bad_types))}")
+    if any(w < 0 for w in weights.values()) or not any(w > 0 for w in weights.values()):
+        raise ValueError("weights must be non-negative with at least one positive")
+    weights = {t: w for t, w in weights.items() if w > 0}
+
+    numbers = data.get("numbers") or [default_number]
+    if isinstance(numbers, str):
+        numbers = [numbers]
+    if not isinstance(numbers, list):
+        raise ValueError("numbers must be a list of phone numbers")
+    for number in numbers:
+        if not isinstance(number, str) or not re.fullmatch(r"\+\d{7,15}", number):
+            raise ValueError(f"Numbers must be quoted E.164 strings, got {number!r}")
+
+    limits = data.get("limits") or {}
+    if not isinstance(limits, dict):
+        raise ValueError("limits must be a mapping")
+    bad_limits = limits.keys() - set(LIMIT_KEYS)
+    if bad_limits:
+        raise ValueError(f"Unknown limits: {', '.join(sorted(bad_limits))}")
+    for key, value in limits.items():
+        valid = _is_number(value) if key == "rate" else _is_int(value)
+        if not valid:
+            kind = "a number" if key == "rate" else "an integer"
+            raise ValueError(f"limits: {key} must be {kind}, got {value!r}")
+    if limits.get("max_calls", 1) < 1 or limits.get("rate", 0) < 0 or limits.get("retries", 0) < 0:
+        raise ValueError("limits: max_calls must be at least 1, rate and retries not negative")
+
+    now = datetime.now().astimezone()
+    start = parse_time(data["start"], "start", now) if data.get("start") else None
+    deadline = None
+    if data.get("deadline"):
+        deadline = parse_time(data["deadline"], "deadline", start or now)
+        if deadline <= (start or now):
+            raise ValueError("deadline must be after the start")
+
+    return Campaign(
+        name=str(data.get("name", "campaign")),
+        total=total,
+        weights=weights,
+        numbers=tuple(numbers),
+        seed=seed,
+        limits=limits,
+        start=start,
+        deadline=deadline,
+    )
+
+
+def load_campaign(path: Path | str, default_number: str) -> Campaign:
+    """Load a JSON or YAML manifest. Numbers default to `default_number`."""
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError(f"PyYAML is needed to load {path}: pip install pyyaml") from e
+            data = yaml.safe_load(f) or {}
+        else:
+            data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: a campaign manifest must be a mapping")
+    return campaign_from_dict(data, default_number)
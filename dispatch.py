@@ -8,19 +8,31 @@ Usage:
     python dispatch.py -s 0 1 2        # Run scenarios 0, 1, 2
     python dispatch.py                 # Run all scenarios
     python dispatch.py -s 0 -c 3       # Run scenario 0 three times
+    python dispatch.py -c 20 -n 5      # Run all scenarios 20 times, 5 calls at once
+    python dispatch.py -g 500 -n 10    # Run 500 generated scenarios, 10 at once
+    python dispatch.py --campaign nightly.yaml  # Run a campaign manifest
 """
 
 import argparse
 import asyncio
 import json
 import os
+import random
 import sys
 import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
 
+import aiohttp
 from dotenv import load_dotenv
 from livekit import api
 
-from scenarios import SCENARIOS
+from campaign import Campaign, CampaignCall, load_campaign
+from scenario_generator import TEMPLATES, generate_scenarios
+from scenarios import SCENARIOS, PatientScenario, scenario_id
 
 load_dotenv()
 
@@ -29,7 +41,39 @@ load_dotenv()
 # =============================================================================
 
 AGENT_NAME = "hospital-patient-bot"
-DELAY_BETWEEN_CALLS = 15
+DELAY_BETWEEN_CALLS = 15  # Seconds a call keeps its slot after dispatch (--no-track)
+
+# Completion tracking
+CALL_EVENTS_PATH = Path(
+    os.getenv("CALL_EVENTS_PATH", Path(__file__).parent / "events" / "call_events.jsonl")
+)
+CALL_TIMEOUT = float(os.getenv("CALL_TIMEOUT", "900"))  # Give up waiting on a call after this
+TRACK_POLL_INTERVAL = 2.0  # Seconds between event file reads and room listings
+ROOM_GRACE_PERIOD = 30.0  # Don't treat a missing room as ended this soon after dispatch
+
+# Call pacing (CLI flags override these)
+MAX_CONCURRENT_CALLS = int(os.getenv("MAX_CONCURRENT_CALLS", "1"))  # SIP channel ceiling
+DISPATCH_RATE = float(os.getenv("DISPATCH_RATE", "0"))  # Calls/sec, 0 = unlimited
+DISPATCH_BURST = int(os.getenv("DISPATCH_BURST", "1"))  # Calls allowed back-to-back
+
+# Adaptive pacing (AIMD) and retries
+DISPATCH_RETRIES = int(os.getenv("DISPATCH_RETRIES", "2"))
+RETRY_BASE_DELAY = 2.0  # Seconds, doubled per attempt
+RETRY_MAX_DELAY = 60.0
+PACING_WINDOW = 20  # Recent outcomes used for the failure rate
+PACING_FAILURE_THRESHOLD = 0.2  # Back off above this failure rate
+PACING_DECREASE = 0.5  # Multiplicative cut on overload
+PACING_RATE_STEP = 0.1  # Additive rate increase, as a fraction of the configured rate
+PACING_COOLDOWN = 10.0  # Minimum seconds between cuts
+OVERLOAD_STATUS = {429, 503}  # HTTP statuses from the LiveKit API
+OVERLOAD_CODES = {"resource_exhausted", "unavailable"}  # Twirp error codes
+OVERLOAD_SIP_CODES = {429, 480, 486, 503}  # Busy / unavailable from the trunk or PBX
+
+# Campaigns
+CAMPAIGN_REPORT_INTERVAL = 60.0  # Seconds between progress lines
+
+# Shared API client
+HTTP_POOL_SIZE = 32  # Keep-alive connections to the LiveKit API
 
 # LiveKit credentials (from .env)
 LIVEKIT_URL = os.getenv("LIVEKIT_URL")
@@ -40,6 +84,346 @@ HOSPITAL_NUMBER = os.getenv("HOSPITAL_PHONE_NUMBER", "+18054398008")
 
 REQUIRED_CONFIG = ["LIVEKIT_URL", "LIVEKIT_API_KEY", "LIVEKIT_API_SECRET", "LIVEKIT_SIP_TRUNK_ID"]
 
+# =============================================================================
+# API Client
+# =============================================================================
+
+
+class DispatchClient:
+    """Long-lived LiveKit API client shared by every dispatch in a run."""
+
+    def __init__(
+        self,
+        url: str | None = LIVEKIT_URL,
+        api_key: str | None = LIVEKIT_API_KEY,
+        api_secret: str | None = LIVEKIT_API_SECRET,
+        pool_size: int = HTTP_POOL_SIZE,
+    ):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=60),
+        )
+        self.api = api.LiveKitAPI(
+            url=url,
+            api_key=api_key,
+            api_secret=api_secret,
+            session=self.session,
+        )
+
+    async def aclose(self):
+        """Close the API client and its connection pool."""
+        await self.api.aclose()
+        await self.session.close()
+
+    async def __aenter__(self) -> "DispatchClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+# =============================================================================
+# Rate Limiting
+# =============================================================================
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` calls/sec with bursts of up to `burst` calls."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token, returning how long to wait before it may be used."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+
+class CallLimiter:
+    """Admission gate for calls: a concurrent-call ceiling plus an optional token bucket.
+
+    Slots are handed out in FIFO order. Dispatches wait only as long as the
+    ceiling or the bucket requires.
+    """
+
+    def __init__(self, max_calls: int, rate: float = 0.0, burst: int = 1):
+        self.max_calls = max_calls
+        self.bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> float:
+        """Wait for a free call slot and a rate token. Returns seconds spent queued."""
+        start = time.monotonic()
+
+        if self.active < self.max_calls and not self._waiters:
+            self.active += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Slot was already handed to us; pass it on
+                if not waiter.cancelled():
+                    self.release()
+                raise
+
+        if self.bucket:
+            delay = self.bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        return time.monotonic() - start
+
+    def set_max_calls(self, max_calls: int):
+        """Change the concurrent-call ceiling, admitting waiters if it grew."""
+        self.max_calls = max_calls
+        self._wake()
+
+    def release(self):
+        """Free a call slot and admit the next waiter."""
+        self.active -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.active < self.max_calls:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+
+class AdaptiveController:
+    """AIMD pacing on top of a CallLimiter.
+
+    Concurrency and rate are halved when overload errors arrive or the recent
+    failure rate crosses a threshold. They climb back by one step after each
+    round of successes, up to the configured ceiling.
+    """
+
+    def __init__(self, limiter: CallLimiter, window: int = PACING_WINDOW):
+        self.limiter = limiter
+        self.ceiling_calls = limiter.max_calls
+        self.ceiling_rate = limiter.bucket.rate if limiter.bucket else 0.0
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self._successes = 0
+        self._last_cut = 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def record(self, success: bool, overloaded: bool = False):
+        """Record a call outcome and adjust pacing."""
+        self.outcomes.append(success)
+
+        if success:
+            self._successes += 1
+            healthy = self.failure_rate < PACING_FAILURE_THRESHOLD
+            if healthy and self._successes >= self.limiter.max_calls:
+                self._increase()
+            return
+
+        self._successes = 0
+        high_failure = len(self.outcomes) >= 5 and self.failure_rate >= PACING_FAILURE_THRESHOLD
+        if (overloaded or high_failure) and time.monotonic() - self._last_cut >= PACING_COOLDOWN:
+            self._decrease("overload" if overloaded else "failure rate")
+
+    def _increase(self):
+        self._successes = 0
+        bucket = self.limiter.bucket
+        at_rate_ceiling = not bucket or bucket.rate >= self.ceiling_rate
+        if self.limiter.max_calls >= self.ceiling_calls and at_rate_ceiling:
+            return
+
+        self.limiter.set_max_calls(min(self.ceiling_calls, self.limiter.max_calls + 1))
+        if bucket:
+            bucket.rate = min(self.ceiling_rate, bucket.rate + self.ceiling_rate * PACING_RATE_STEP)
+        self._log("increase")
+
+    def _decrease(self, reason: str):
+        self._last_cut = time.monotonic()
+        self._successes = 0
+        self.limiter.set_max_calls(max(1, int(self.limiter.max_calls * PACING_DECREASE)))
+        bucket = self.limiter.bucket
+        if bucket:
+            bucket.rate = max(self.ceiling_rate * PACING_RATE_STEP, bucket.rate * PACING_DECREASE)
+        self._log(f"backoff ({reason})")
+
+    def _log(self, action: str):
+        rate = f"{self.limiter.bucket.rate:.2f}/s" if self.limiter.bucket else "unlimited"
+        print(
+            f"[pacing] {action}: max_calls={self.limiter.max_calls}/{self.ceiling_calls} "
+            f"rate={rate} failure_rate={self.failure_rate:.0%}"
+        )
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given retry attempt (0-based)."""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+
+def is_overload(error: Exception) -> bool:
+    """True if a LiveKit API error means we are sending calls too fast."""
+    if isinstance(error, api.TwirpError):
+        return error.status in OVERLOAD_STATUS or error.code in OVERLOAD_CODES
+    return False
+
+
+# =============================================================================
+# Completion Tracking
+# =============================================================================
+
+
+@dataclass
+class CallOutcome:
+    """How a dispatched call ended."""
+    status: str  # completed, sip_failed, lost, ended or timeout (see CompletionTracker)
+    events: dict[str, float] = field(default_factory=dict)  # Event name -> unix time
+    sip_status: int | None = None
+
+
+@dataclass
+class TrackedCall:
+    """A dispatched call the tracker is waiting on."""
+    dispatched_at: float  # Unix time
+    future: asyncio.Future
+    events: dict[str, float] = field(default_factory=dict)
+    sip_status: str | None = None
+
+
+class CompletionTracker:
+    """Follows dispatched calls until they actually finish.
+
+    The agent appends lifecycle events to CALL_EVENTS_PATH. When the worker
+    runs on another machine the file stays empty. Room listings through the
+    shared API client still catch a call's room disappearing; such a call is
+    "ended". Once events have arrived for any call, the file is known to be
+    shared, and a room that disappears without events is "lost": the agent
+    never ran.
+    """
+
+    def __init__(
+        self,
+        lk: api.LiveKitAPI,
+        events_path: Path = CALL_EVENTS_PATH,
+        poll_interval: float = TRACK_POLL_INTERVAL,
+    ):
+        self.lk = lk
+        self.events_path = events_path
+        self.poll_interval = poll_interval
+        self._calls: dict[str, TrackedCall] = {}
+        self._offset = events_path.stat().st_size if events_path.exists() else 0
+        self._partial = ""
+        self._task: asyncio.Task | None = None
+        self.events_seen = False  # The agent writes to the same events file
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def aclose(self):
+        if self._task:
+            self._task.cancel()
+
+    def track(self, room_name: str):
+        """Start following a call whose dispatch just succeeded."""
+        future = asyncio.get_running_loop().create_future()
+        self._calls[room_name] = TrackedCall(time.time(), future)
+
+    async def wait(self, room_name: str, timeout: float = CALL_TIMEOUT) -> CallOutcome:
+        """Wait until the call in `room_name` has finished."""
+        call = self._calls[room_name]
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.future), timeout)
+        except asyncio.TimeoutError:
+            return CallOutcome("timeout", call.events)
+        finally:
+            self._calls.pop(room_name, None)
+
+    async def _run(self):
+        # Nothing may end this loop early; every tracked call would then hold
+        # its slot until CALL_TIMEOUT
+        while True:
+            try:
+                self._read_events()
+            except Exception as e:
+                print(f"WARNING: reading call events failed: {e}")
+            try:
+                await self._poll_rooms()
+            except Exception as e:
+                print(f"WARNING: room poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def _read_events(self):
+        if not self.events_path.exists():
+            return
+        with open(self.events_path) as f:
+            f.seek(self._offset)
+            data = f.read()
+            self._offset = f.tell()
+
+        *lines, self._partial = (self._partial + data).split("\n")
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            event, ts = record.get("event"), record.get("ts")
+            if not isinstance(event, str) or not isinstance(ts, (int, float)):
+                continue
+            self.events_seen = True
+            call = self._calls.get(record.get("room"))
+            if not call:
+                continue
+            call.events[event] = ts
+            if event == "sip_failed":
+                call.sip_status = record.get("sip_status")
+            if event == "finalized":
+                self._finish(record["room"])
+
+    async def _poll_rooms(self):
+        cutoff = time.time() - ROOM_GRACE_PERIOD
+        names = [name for name, call in self._calls.items() if call.dispatched_at < cutoff]
+        if not names:
+            return
+        response = await self.lk.room.list_rooms(api.ListRoomsRequest(names=names))
+        live = {room.name for room in response.rooms}
+        for name in names:
+            if name not in live:
+                self._finish(name)
+
+    def _finish(self, room_name: str):
+        call = self._calls.get(room_name)
+        if not call or call.future.done():
+            return
+
+        if "sip_failed" in call.events:
+            status = "sip_failed"
+        elif call.events.keys() & {"sip_connected", "hung_up", "finalized"}:
+            status = "completed"
+        elif self.events_seen:
+            status = "lost"
+        else:
+            status = "ended"
+
+        try:
+            sip_status = int(call.sip_status)
+        except (TypeError, ValueError):
+            sip_status = None
+        call.future.set_result(CallOutcome(status, call.events, sip_status))
+
+
 # =============================================================================
 # Dispatch Functions
 # =============================================================================
@@ -50,30 +434,64 @@ def check_config() -> list[str]:
     return [name for name in REQUIRED_CONFIG if not os.getenv(name)]
 
 
-async def dispatch_call(scenario_index: int) -> bool:
-    """Dispatch a single call to the hospital. Returns True on success."""
-    scenario = SCENARIOS[scenario_index]
+@dataclass
+class DispatchResult:
+    """Outcome of a single dispatch."""
+    call_num: int
+    scenario_index: int | None  # None for a generated scenario
+    room_name: str
+    success: bool
+    latency: float  # Seconds spent in create_dispatch
+    queue_wait: float = 0.0  # Seconds waiting for a call slot and rate token
+    attempts: int = 1
+    overloaded: bool = False  # Failed with a rate-limit / unavailable error
+    outcome: str = ""  # Call outcome when completion tracking is on
+    call_duration: float = 0.0  # Seconds from dispatch until the call finished
+    scenario_type: str = ""
+    phone_number: str = ""
+
+
+async def dispatch_call(
+    lk: api.LiveKitAPI,
+    scenario: int | PatientScenario,
+    call_num: int = 1,
+    total: int = 1,
+    attempt: int = 0,
+    phone_number: str = HOSPITAL_NUMBER,
+) -> DispatchResult:
+    """Dispatch a single call to `phone_number`.
+
+    `scenario` is an index into SCENARIOS, or a generated scenario, which is
+    sent whole in the job metadata.
+    """
+    if isinstance(scenario, int):
+        scenario_index, label = scenario, str(scenario)
+        scenario = SCENARIOS[scenario_index]
+        scenario_fields = {"scenario_index": scenario_index, "scenario_id": scenario_id(scenario)}
+    else:
+        scenario_index, label = None, "gen"
+        scenario_fields = {"scenario": scenario.to_dict()}
+    retry = f" (retry {attempt})" if attempt else ""
 
     print(f"\n{'=' * 50}")
-    print(f"[{scenario_index}] {scenario.name}")
+    print(f"[Call {call_num}/{total}] [{label}] {scenario.name}{retry}")
     print(f"Goal: {scenario.goal}")
     print(f"{'=' * 50}")
 
-    lk = api.LiveKitAPI(
-        url=LIVEKIT_URL,
-        api_key=LIVEKIT_API_KEY,
-        api_secret=LIVEKIT_API_SECRET,
-    )
+    # Call number keeps room names unique when calls are dispatched in parallel
+    room_name = f"call-{label}-{int(time.time())}-{call_num}"
+    if attempt:
+        room_name += f"-r{attempt}"
+    start = time.monotonic()
 
     try:
-        room_name = f"call-{scenario_index}-{int(time.time())}"
         metadata = json.dumps({
-            "scenario_index": scenario_index,
-            "phone_number": HOSPITAL_NUMBER,
+            **scenario_fields,
+            "phone_number": phone_number,
             "sip_trunk_id": SIP_TRUNK_ID,
         })
 
-        print(f"Dispatching to {HOSPITAL_NUMBER}...")
+        print(f"Dispatching to {phone_number}...")
 
         await lk.agent_dispatch.create_dispatch(
             api.CreateAgentDispatchRequest(
@@ -82,39 +500,335 @@ async def dispatch_call(scenario_index: int) -> bool:
                 metadata=metadata,
             )
         )
-        print(f"Dispatched: room={room_name}")
-        return True
+        latency = time.monotonic() - start
+        print(f"Dispatched: room={room_name} ({latency * 1000:.0f}ms)")
+        return DispatchResult(
+            call_num, scenario_index, room_name, True, latency,
+            scenario_type=scenario.scenario_type, phone_number=phone_number,
+        )
 
     except Exception as e:
         print(f"ERROR: {e}")
-        return False
-
-    finally:
-        await lk.aclose()
+        return DispatchResult(
+            call_num, scenario_index, room_name, False, time.monotonic() - start,
+            overloaded=is_overload(e), scenario_type=scenario.scenario_type,
+            phone_number=phone_number,
+        )
 
 
-async def run_scenarios(indices: list[int], count: int = 1):
+async def run_scenarios(
+    indices: list[int],
+    count: int = 1,
+    max_calls: int = MAX_CONCURRENT_CALLS,
+    hold: float = DELAY_BETWEEN_CALLS,
+    rate: float = DISPATCH_RATE,
+    burst: int = DISPATCH_BURST,
+    retries: int = DISPATCH_RETRIES,
+    track: bool = True,
+):
     """Run specified scenarios with optional repeat count."""
-    total = len(indices) * count
-    success = 0
+    calls = (idx for _ in range(count) for idx in indices)
+    await run_calls(calls, len(indices) * count, max_calls, hold, rate, burst, retries, track)
+
+
+async def run_calls(
+    calls: Iterable[int | PatientScenario | CampaignCall],
+    total: int,
+    max_calls: int = MAX_CONCURRENT_CALLS,
+    hold: float = DELAY_BETWEEN_CALLS,
+    rate: float = DISPATCH_RATE,
+    burst: int = DISPATCH_BURST,
+    retries: int = DISPATCH_RETRIES,
+    track: bool = True,
+    deadline: float | None = None,
+    progress: "CampaignProgress | None" = None,
+):
+    """Dispatch a stream of scenario indices, generated scenarios or campaign calls.
+
+    Up to `max_calls` calls are in flight at once, dispatched at no more than
+    `rate` calls/sec. With `track`, a call keeps its slot until it has actually
+    finished. Without it, the slot is held for `hold` seconds after dispatch.
+    Failed dispatches and SIP failures are retried with backoff, and pacing
+    adapts to the failure rate. `calls` is consumed lazily, a few calls ahead
+    of the free slots. No call or retry is placed after `deadline` (unix
+    time); calls already in progress are left to finish.
+    """
+    limiter = CallLimiter(max_calls, rate, burst)
+    controller = AdaptiveController(limiter)
+    loop = asyncio.get_running_loop()
+
+    def past_deadline() -> bool:
+        return deadline is not None and time.time() >= deadline
+
+    async def place(
+        client: DispatchClient, call_num: int, call: int | PatientScenario | CampaignCall
+    ) -> DispatchResult | None:
+        scenario, number = call, HOSPITAL_NUMBER
+        if isinstance(call, CampaignCall):
+            scenario, number = call.scenario, call.phone_number
+
+        queue_wait = 0.0
+        result = None
+        for attempt in range(retries + 1):
+            queue_wait += await limiter.acquire()
+            if past_deadline():
+                limiter.release()
+                break
+            result = await dispatch_call(client.api, scenario, call_num, total, attempt, number)
+            result.queue_wait = queue_wait
+            result.attempts = attempt + 1
+            if progress and result.success:
+                progress.dispatched(result)
+
+            if result.success and not tracker:
+                controller.record(True)
+                loop.call_later(hold, limiter.release)
+                break
+
+            if result.success:
+                dispatched_at = time.monotonic()
+                tracker.track(result.room_name)
+                outcome = await tracker.wait(result.room_name)
+                limiter.release()
+                result.outcome = outcome.status
+                result.call_duration = time.monotonic() - dispatched_at
+                print(f"[Call {call_num}] {outcome.status} after {result.call_duration:.0f}s")
+
+                failed = outcome.status in ("sip_failed", "lost")
+                controller.record(not failed, outcome.sip_status in OVERLOAD_SIP_CODES)
+                if not failed:
+                    break
+            else:
+                controller.record(False, result.overloaded)
+                limiter.release()
+
+            if attempt < retries and not past_deadline():
+                delay = retry_delay(attempt)
+                print(f"[Call {call_num}] retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                queue_wait += delay
+        if progress and result:
+            progress.finished(result)
+        return result
+
+    async with DispatchClient() as client:
+        tracker = CompletionTracker(client.api) if track else None
+        if tracker:
+            tracker.start()
+
+        start = time.monotonic()
+        results: list[DispatchResult | None] = []
+        pending: set[asyncio.Task] = set()
+        try:
+            for call_num, call in enumerate(calls, 1):
+                # Only pull from the stream once there is room for more calls
+                if len(pending) >= 2 * max_calls:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    results.extend(task.result() for task in done)
+                if past_deadline():
+                    print("\nDeadline reached, no more calls will be placed")
+                    break
+                pending.add(asyncio.create_task(place(client, call_num, call)))
+            if pending:
+                done, _ = await asyncio.wait(pending)
+                results.extend(task.result() for task in done)
+        finally:
+            for task in pending:
+                task.cancel()
+            if tracker:
+                await tracker.aclose()
+        elapsed = time.monotonic() - start
+
+    placed = sorted((r for r in results if r), key=lambda r: r.call_num)
+    if placed:
+        print_summary(placed, elapsed)
+
+
+def print_summary(results: list[DispatchResult], elapsed: float):
+    """Print per-call dispatch latency and overall throughput."""
+    success = [r for r in results if r.success]
+
+    print(f"\n{'=' * 50}")
+    print("Dispatch latency:")
+    for r in results:
+        status = "ok" if r.success else "FAILED"
+        print(
+            f"  [Call {r.call_num}] {r.room_name}: {r.latency * 1000:.0f}ms "
+            f"(queued {r.queue_wait:.1f}s, attempts {r.attempts}) {status}"
+        )
 
-    for run in range(count):
-        for i, idx in enumerate(indices):
-            call_num = run * len(indices) + i + 1
-            print(f"\n[Call {call_num}/{total}]")
+    if success:
+        latencies = sorted(r.latency for r in success)
+        avg = sum(latencies) / len(latencies)
+        print(
+            f"Latency: min {latencies[0] * 1000:.0f}ms, "
+            f"avg {avg * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms"
+        )
 
-            if await dispatch_call(idx):
-                success += 1
+    waits = [r.queue_wait for r in results]
+    print(f"Queue wait: avg {sum(waits) / len(waits):.1f}s, max {max(waits):.1f}s")
 
-            if call_num < total:
-                print(f"\nWaiting {DELAY_BETWEEN_CALLS}s...")
-                await asyncio.sleep(DELAY_BETWEEN_CALLS)
+    rate = len(success) / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"Wall clock: {elapsed:.1f}s ({rate:.1f} calls/min)")
+    print(f"Complete: {len(success)}/{len(results)} calls dispatched")
 
-    print(f"\n{'=' * 50}")
-    print(f"Complete: {success}/{total} calls dispatched")
+    outcomes = [r.outcome for r in results if r.outcome]
+    if outcomes:
+        counts = ", ".join(f"{name} {outcomes.count(name)}" for name in sorted(set(outcomes)))
+        durations = [r.call_duration for r in results if r.outcome]
+        print(f"Outcomes: {counts}")
+        avg = sum(durations) / len(durations)
+        print(f"Call duration: avg {avg:.0f}s, max {max(durations):.0f}s")
     print(f"{'=' * 50}")
 
 
+# =============================================================================
+# Campaigns
+# =============================================================================
+
+
+def format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+class CampaignProgress:
+    """Follows a campaign against its plan: calls placed over time, by type and number."""
+
+    def __init__(self, campaign: Campaign, started_at: float):
+        self.campaign = campaign
+        self.started_at = started_at  # Unix time
+        self.deadline = campaign.deadline.timestamp() if campaign.deadline else None
+        self.targets = campaign.targets()
+        self.placed: set[int] = set()  # Call numbers dispatched at least once
+        self.by_type: Counter[str] = Counter()
+        self.by_number: Counter[str] = Counter()
+        self.ended = 0  # Placed calls that have finished
+        self.failed = 0
+
+    @property
+    def planned_rate(self) -> float | None:
+        """Calls/min needed to place every call by the deadline."""
+        if self.deadline is None:
+            return None
+        return self.campaign.total / (self.deadline - self.started_at) * 60
+
+    def dispatched(self, result: DispatchResult):
+        if result.call_num in self.placed:
+            return  # A retry of a call already counted
+        self.placed.add(result.call_num)
+        self.by_type[result.scenario_type] += 1
+        self.by_number[result.phone_number] += 1
+
+    def finished(self, result: DispatchResult):
+        if result.call_num in self.placed:
+            self.ended += 1
+        if not result.success or result.outcome in ("sip_failed", "lost", "timeout"):
+            self.failed += 1
+
+    def status(self, now: float) -> str:
+        elapsed = max(now - self.started_at, 1e-9)
+        placed = len(self.placed)
+        remaining = self.campaign.total - placed
+        rate = placed / elapsed * 60
+
+        clock = f"{datetime.fromtimestamp(now):%H:%M:%S}"
+        line = f"[campaign] {clock} placed {placed}/{self.campaign.total}"
+        if self.deadline is not None:
+            planned = min(self.campaign.total, round(self.planned_rate * elapsed / 60))
+            line += f" (plan {planned})"
+        line += (
+            f", {placed - self.ended} in flight, {self.failed} failed"
+            f" | {rate:.1f} calls/min"
+        )
+        if self.deadline is not None:
+            line += f" vs plan {self.planned_rate:.1f}"
+            if remaining and now < self.deadline:
+                line += f", need {remaining / (self.deadline - now) * 60:.1f}"
+        if remaining and rate > 0:
+            eta = datetime.fromtimestamp(now + remaining / rate * 60)
+            line += f" | ETA {eta:%H:%M}"
+            if self.deadline is not None:
+                line += f" (deadline {self.campaign.deadline:%H:%M})"
+        return line
+
+    async def report_every(self, interval: float = CAMPAIGN_REPORT_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.status(time.time()))
+
+    def print_summary(self, now: float):
+        campaign = self.campaign
+        elapsed = now - self.started_at
+        placed = len(self.placed)
+        rate = placed / elapsed * 60 if elapsed > 0 else 0.0
+
+        print(f"\n{'=' * 50}")
+        print(f"Campaign {campaign.name}")
+        throughput = f"Placed: {placed}/{campaign.total} in {format_duration(elapsed)}, "
+        throughput += f"{rate:.1f} calls/min"
+        if self.planned_rate is not None:
+            throughput += f" (plan {self.planned_rate:.1f} calls/min)"
+        print(throughput)
+        if self.deadline is not None:
+            deadline = f"{campaign.deadline:%Y-%m-%d %H:%M}"
+            if now >= self.deadline:
+                print(f"Deadline {deadline}: reached, {campaign.total - placed} calls not placed")
+            else:
+                print(f"Deadline {deadline}: finished {format_duration(self.deadline - now)} early")
+        print("By type (placed/target): " + ", ".join(
+            f"{t} {self.by_type[t]}/{target}" for t, target in sorted(self.targets.items())
+        ))
+        print("By number: " + ", ".join(
+            f"{number} {self.by_number[number]}" for number in campaign.numbers
+        ))
+        print(f"Failed: {self.failed}")
+        print(f"{'=' * 50}")
+
+
+async def run_campaign(
+    campaign: Campaign,
+    max_calls: int = MAX_CONCURRENT_CALLS,
+    hold: float = DELAY_BETWEEN_CALLS,
+    rate: float = DISPATCH_RATE,
+    burst: int = DISPATCH_BURST,
+    retries: int = DISPATCH_RETRIES,
+    track: bool = True,
+):
+    """Run a campaign from its start time until every call is placed or the deadline passes.
+
+    Calls stream from the manifest as slots free up, and a progress line
+    against the plan is printed every CAMPAIGN_REPORT_INTERVAL seconds.
+    """
+    if campaign.start:
+        wait = campaign.start.timestamp() - time.time()
+        if wait > 0:
+            print(f"Waiting until {campaign.start:%Y-%m-%d %H:%M} to start")
+            await asyncio.sleep(wait)
+
+    progress = CampaignProgress(campaign, time.time())
+    if progress.deadline is not None and rate > 0:
+        window = progress.deadline - progress.started_at
+        if rate * window < campaign.total:
+            print(
+                f"WARNING: at {rate:g} calls/sec only {int(rate * window)} of "
+                f"{campaign.total} calls fit before the deadline"
+            )
+
+    reporter = asyncio.create_task(progress.report_every())
+    try:
+        await run_calls(
+            campaign.calls(), campaign.total, max_calls, hold, rate, burst, retries, track,
+            deadline=progress.deadline, progress=progress,
+        )
+    finally:
+        reporter.cancel()
+    progress.print_summary(time.time())
+
+
 # =============================================================================
 # CLI
 # =============================================================================
@@ -135,6 +849,44 @@ def main():
     )
     parser.add_argument("-s", "--scenario", type=int, nargs="+", help="Scenario indices to run")
     parser.add_argument("-c", "--count", type=int, default=1, help="Repeat count for each scenario")
+    parser.add_argument(
+        "-n", "--concurrency", "--max-calls", dest="max_calls", type=int,
+        default=MAX_CONCURRENT_CALLS,
+        help="Maximum calls in flight at once (env: MAX_CONCURRENT_CALLS)",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=DISPATCH_RATE,
+        help="Maximum calls per second, 0 for unlimited (env: DISPATCH_RATE)",
+    )
+    parser.add_argument(
+        "--burst", type=int, default=DISPATCH_BURST,
+        help="Calls allowed back-to-back before --rate applies (env: DISPATCH_BURST)",
+    )
+    parser.add_argument(
+        "--retries", type=int, default=DISPATCH_RETRIES,
+        help="Retries per failed dispatch (env: DISPATCH_RETRIES)",
+    )
+    parser.add_argument(
+        "--hold", type=float, default=DELAY_BETWEEN_CALLS,
+        help="With --no-track, seconds each call keeps its slot after dispatch",
+    )
+    parser.add_argument(
+        "--no-track", dest="track", action="store_false",
+        help="Don't wait for calls to finish; free slots after --hold seconds",
+    )
+    parser.add_argument(
+        "-g", "--generate", type=int, metavar="N",
+        help="Dispatch N generated scenarios instead of the scenario list",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --generate")
+    parser.add_argument(
+        "--types", nargs="+", choices=sorted({t.scenario_type for t in TEMPLATES}),
+        help="With --generate, only these scenario types (sampled evenly)",
+    )
+    parser.add_argument(
+        "--campaign", metavar="MANIFEST",
+        help="Run a campaign manifest (JSON or YAML, see campaign.py)",
+    )
     parser.add_argument("-l", "--list", action="store_true", help="List available scenarios")
     args = parser.parse_args()
 
@@ -142,6 +894,20 @@ def main():
         list_scenarios()
         return
 
+    campaign = None
+    if args.campaign:
+        if args.scenario or args.generate is not None:
+            print("ERROR: --campaign can't be combined with --scenario or --generate")
+            sys.exit(1)
+        try:
+            campaign = load_campaign(args.campaign, HOSPITAL_NUMBER)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"ERROR: Invalid campaign {args.campaign}: {e}")
+            sys.exit(1)
+        # Manifest limits replace the env defaults; flags given on the command line still win
+        parser.set_defaults(**campaign.limits)
+        args = parser.parse_args()
+
     # Validate config
     missing = check_config()
     if missing:
@@ -149,6 +915,13 @@ def main():
         print("Check your .env file")
         sys.exit(1)
 
+    if args.generate is not None and args.scenario:
+        print("ERROR: --generate and --scenario can't be combined")
+        sys.exit(1)
+    if args.generate is not None and args.generate < 1:
+        print("ERROR: --generate must be at least 1")
+        sys.exit(1)
+
     # Validate scenario indices
     indices = args.scenario if args.scenario else list(range(len(SCENARIOS)))
     for idx in indices:
@@ -156,12 +929,59 @@ def main():
             print(f"ERROR: Invalid scenario index: {idx}")
             sys.exit(1)
 
+    if args.max_calls < 1:
+        print("ERROR: --concurrency must be at least 1")
+        sys.exit(1)
+    if args.rate < 0:
+        print("ERROR: --rate must not be negative")
+        sys.exit(1)
+    if args.retries < 0:
+        print("ERROR: --retries must not be negative")
+        sys.exit(1)
+
     # Run
     print("Hospital Voice Bot - Dispatcher")
-    print(f"Target: {HOSPITAL_NUMBER}")
-    print(f"Scenarios: {len(indices)} x {args.count} = {len(indices) * args.count} calls")
+    print(f"Target: {', '.join(campaign.numbers) if campaign else HOSPITAL_NUMBER}")
+    if campaign:
+        mix = ", ".join(f"{t} {n}" for t, n in sorted(campaign.targets().items()))
+        print(f"Campaign: {campaign.name}, {campaign.total} calls ({mix}, seed {campaign.seed})")
+        if campaign.deadline:
+            print(f"Deadline: {campaign.deadline:%Y-%m-%d %H:%M}")
+    elif args.generate:
+        types = ", ".join(args.types) if args.types else "all types"
+        print(f"Scenarios: {args.generate} generated ({types}, seed {args.seed})")
+    else:
+        print(f"Scenarios: {len(indices)} x {args.count} = {len(indices) * args.count} calls")
+    print(f"Concurrency: {args.max_calls}")
+    if args.rate:
+        print(f"Rate: {args.rate:g} calls/sec (burst {args.burst})")
+
+    if campaign:
+        asyncio.run(
+            run_campaign(
+                campaign, args.max_calls, args.hold, args.rate, args.burst, args.retries,
+                args.track,
+            )
+        )
+        return
 
-    asyncio.run(run_scenarios(indices, args.count))
+    if args.generate:
+        weights = dict.fromkeys(args.types, 1.0) if args.types else None
+        calls = generate_scenarios(args.generate, args.seed, weights)
+        asyncio.run(
+            run_calls(
+                calls, args.generate, args.max_calls, args.hold, args.rate, args.burst,
+                args.retries, args.track,
+            )
+        )
+        return
+
+    asyncio.run(
+        run_scenarios(
+            indices, args.count, args.max_calls, args.hold, args.rate, args.burst,
+            args.retries, args.track,
+        )
+    )
 
 
 if __name__ == "__main__":
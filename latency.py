@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Turn latency statistics for the patient bot.
+
+Reads the .jsonl transcripts written by agent.py and reports p50/p95/p99
+latency per pipeline stage, across all calls and per scenario.
+
+Usage:
+    python latency.py                          # All transcripts
+    python latency.py transcripts/*.jsonl      # Specific calls
+"""
+
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+TRANSCRIPTS_DIR = Path(__file__).parent / "transcripts"
+
+# Stage name -> label
+STAGES = {
+    "stt_to_llm": "STT -> LLM",
+    "llm_to_tts": "LLM -> TTS",
+    "turnaround": "Turn-around",
+}
+
+# =============================================================================
+# Statistics
+# =============================================================================
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: list[float]) -> dict:
+    """p50/p95/p99 and count for a list of latencies."""
+    if not values:
+        return {"count": 0}
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "count": len(values),
+    }
+
+
+def turn_latencies(entry: dict) -> dict[str, float]:
+    """Stage latencies (ms) for a transcript entry, where its timings allow."""
+    stt = entry.get("stt_final_ms")
+    llm = entry.get("llm_first_token_ms")
+    tts = entry.get("tts_first_byte_ms")
+
+    latencies = {}
+    if stt is not None and llm is not None:
+        latencies["stt_to_llm"] = llm - stt
+    if llm is not None and tts is not None:
+        latencies["llm_to_tts"] = tts - llm
+    if stt is not None and tts is not None:
+        latencies["turnaround"] = tts - stt
+    return latencies
+
+
+def format_table(samples: dict[str, list[float]]) -> list[str]:
+    """Render per-stage percentiles as text lines."""
+    lines = [f"{'Turn latency (ms)':<18}{'p50':>7}{'p95':>7}{'p99':>7}{'n':>6}"]
+    for stage, label in STAGES.items():
+        stats = summarize(samples.get(stage, []))
+        if not stats["count"]:
+            lines.append(f"  {label:<16}{'-':>7}{'-':>7}{'-':>7}{0:>6}")
+            continue
+        lines.append(
+            f"  {label:<16}{stats['p50']:>7.0f}{stats['p95']:>7.0f}"
+            f"{stats['p99']:>7.0f}{stats['count']:>6}"
+        )
+    return lines
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+
+def collect(paths: list[Path]) -> dict[str, dict[str, list[float]]]:
+    """Stage latencies from transcripts, keyed by scenario."""
+    by_scenario: dict[str, dict[str, list[float]]] = {}
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("type") != "entry" or entry.get("speaker") != "PATIENT":
+                    continue
+                samples = by_scenario.setdefault(entry.get("scenario", "?"), {})
+                for stage, value in turn_latencies(entry).items():
+                    samples.setdefault(stage, []).append(value)
+    return by_scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report turn latency across calls")
+    parser.add_argument("paths", type=Path, nargs="*", help="JSONL transcripts (default: all)")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(TRANSCRIPTS_DIR.glob("*.jsonl"))
+    if not paths:
+        print("No transcripts found")
+        sys.exit(1)
+
+    by_scenario = collect(paths)
+    overall: dict[str, list[float]] = {}
+    for samples in by_scenario.values():
+        for stage, values in samples.items():
+            overall.setdefault(stage, []).extend(values)
+
+    print(f"Calls: {len(paths)}\n")
+    print("\n".join(format_table(overall)))
+    for scenario, samples in sorted(by_scenario.items()):
+        print(f"\n{scenario}")
+        print("\n".join(format_table(samples)))
+
+
+if __name__ == "__main__":
+    main()
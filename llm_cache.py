@@ -0,0 +1,159 @@
+"""
+Record/replay cache for patient-bot LLM responses.
+
+Responses are keyed on the model, the scenario and a normalized copy of the
+conversation so far. Small STT differences in casing, punctuation or
+spacing still hit the same entry.
+
+Modes (LLM_CACHE_MODE):
+    passthrough  Always call the LLM (default)
+    record       Call the LLM and store every completed response
+    replay       Serve responses from the cache; fail on a miss
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import AsyncIterable, Callable
+
+from livekit.agents import llm
+
+from cache_store import DiskLRUStore
+from scenarios import PatientScenario
+
+logger = logging.getLogger("patient-bot")
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+CACHE_DIR = Path(os.getenv("CACHE_DIR", Path(__file__).parent / "cache"))
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "passthrough")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "64"))
+
+MODES = ("passthrough", "record", "replay")
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode when a conversation has no recorded response."""
+
+
+# =============================================================================
+# Keys
+# =============================================================================
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def normalize_history(chat_ctx: llm.ChatContext) -> list:
+    """Conversation items reduced to what should decide the reply.
+
+    System messages are skipped because they come from the scenario, which
+    is already part of the key.
+    """
+    history = []
+    for item in chat_ctx.items:
+        if item.type == "message":
+            if item.role in ("system", "developer"):
+                continue
+            history.append([item.role, normalize_text(item.text_content or "")])
+        elif item.type == "function_call":
+            history.append(["call", item.name, item.arguments])
+        elif item.type == "function_call_output":
+            history.append(["output", item.name, normalize_text(item.output)])
+    return history
+
+
+def cache_key(model: str, scenario: PatientScenario, chat_ctx: llm.ChatContext) -> str:
+    """Content address for a request."""
+    payload = json.dumps(
+        {"model": model, "scenario": scenario.to_dict(), "history": normalize_history(chat_ctx)},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class LLMResponseCache:
+    """Wraps LLM streams to record or replay responses."""
+
+    def __init__(self, mode: str, store: DiskLRUStore | None = None, model: str = ""):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode} (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.model = model
+        self.store = store
+        if self.store is None and mode != "passthrough":
+            self.store = DiskLRUStore(CACHE_DIR / "llm", LLM_CACHE_MAX_MB * 1024 * 1024, ".json")
+        self.hits = 0
+        self.misses = 0
+
+    def wrap(
+        self,
+        scenario: PatientScenario,
+        chat_ctx: llm.ChatContext,
+        generate: Callable[[], AsyncIterable],
+    ) -> AsyncIterable:
+        """Stream for this request: replayed, recorded or passed straight through."""
+        if self.mode == "passthrough":
+            return generate()
+
+        key = cache_key(self.model, scenario, chat_ctx)
+        if self.mode == "replay":
+            return self._replay(key, scenario)
+        return self._record(key, generate())
+
+    async def _replay(self, key: str, scenario: PatientScenario) -> AsyncIterable:
+        # Store reads and writes are file I/O; keep them off the event loop
+        data = await asyncio.to_thread(self.store.get, key)
+        if data is None:
+            self.misses += 1
+            raise LLMCacheMiss(f"No recorded LLM response for {scenario.name} ({key[:12]})")
+        self.hits += 1
+        response = json.loads(data)
+
+        if response["text"]:
+            yield response["text"]
+        for call in response["tool_calls"]:
+            yield llm.ChatChunk(
+                id=f"replay_{uuid.uuid4().hex[:12]}",
+                delta=llm.ChoiceDelta(
+                    role="assistant",
+                    tool_calls=[
+                        llm.FunctionToolCall(
+                            name=call["name"],
+                            arguments=call["arguments"],
+                            call_id=f"replay_{uuid.uuid4().hex[:12]}",
+                        )
+                    ],
+                ),
+            )
+
+    async def _record(self, key: str, stream: AsyncIterable) -> AsyncIterable:
+        text: list[str] = []
+        tool_calls: list[dict] = []
+        async for chunk in stream:
+            if isinstance(chunk, str):
+                text.append(chunk)
+            elif chunk.delta:
+                if chunk.delta.content:
+                    text.append(chunk.delta.content)
+                for call in chunk.delta.tool_calls or []:
+                    tool_calls.append({"name": call.name, "arguments": call.arguments})
+            yield chunk
+
+        # Only completed responses get here; interrupted ones are not stored
+        data = json.dumps({"text": "".join(text), "tool_calls": tool_calls}).encode()
+        await asyncio.to_thread(self.store.put, key, data)
@@ -0,0 +1,110 @@
+"""
+Compiled prompt templates for the patient agent.
+
+Templates are parsed once. Rendered prompts are memoized per template and
+scenario, in a bounded LRU. Scenarios hash by content, so equal scenarios
+share an entry. Every call for a scenario then sends a byte-identical
+system prompt, which keeps Anthropic prompt caching hitting. Each prompt
+carries a fingerprint for the transcript header.
+"""
+
+import hashlib
+import os
+import string
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from scenarios import PatientScenario
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+PROMPT_CACHE_SIZE = int(os.getenv("PROMPT_CACHE_SIZE", "1024"))  # Rendered prompts kept
+
+
+def fingerprint(text: str) -> str:
+    """Short, stable hash of prompt text."""
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+
+# =============================================================================
+# Templates
+# =============================================================================
+
+
+class PromptTemplate:
+    """A template with named `{field}` placeholders, parsed once."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.fingerprint = fingerprint(text)
+        self.parts: list[tuple[str, str | None]] = []
+        for literal, name, spec, conversion in string.Formatter().parse(text):
+            if name is not None and (not name.isidentifier() or spec or conversion):
+                raise ValueError(f"Unsupported placeholder in prompt template: {{{name}}}")
+            self.parts.append((literal, name))
+        self.fields = {name for _, name in self.parts if name}
+
+    def render(self, **values: str) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Missing prompt fields: {', '.join(sorted(missing))}")
+        return "".join(
+            literal + (values[name] if name else "") for literal, name in self.parts
+        )
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    text: str
+    fingerprint: str
+
+
+def format_details(scenario: PatientScenario) -> str:
+    """Scenario details as a bullet list, sorted so equal scenarios render identically."""
+    if not scenario.details:
+        return ""
+    return "Details:\n" + "\n".join(
+        f"- {key}: {value}" for key, value in sorted(scenario.details.to_dict().items())
+    )
+
+
+def scenario_fields(scenario: PatientScenario) -> dict[str, str]:
+    return {
+        "name": scenario.name,
+        "dob": scenario.date_of_birth,
+        "goal": scenario.goal,
+        "details": format_details(scenario),
+    }
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class PromptCache:
+    """LRU of rendered prompts keyed by (template, scenario)."""
+
+    def __init__(self, max_size: int = PROMPT_CACHE_SIZE):
+        self.max_size = max_size
+        self._prompts: OrderedDict[tuple[str, PatientScenario], RenderedPrompt] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, template: PromptTemplate, scenario: PatientScenario) -> RenderedPrompt:
+        key = (template.fingerprint, scenario)
+        prompt = self._prompts.get(key)
+        if prompt is not None:
+            self._prompts.move_to_end(key)
+            self.hits += 1
+            return prompt
+
+        self.misses += 1
+        text = template.render(**scenario_fields(scenario))
+        prompt = RenderedPrompt(text, fingerprint(text))
+        self._prompts[key] = prompt
+        if len(self._prompts) > self.max_size:
+            self._prompts.popitem(last=False)
+        return prompt
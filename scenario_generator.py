@@ -0,0 +1,222 @@
+"""
+Combinatorial patient scenario generator.
+
+Expands per-type templates into a lazy, seedable stream of PatientScenario
+objects, varying names, dates of birth, goals, details and speaking style.
+Scenario types are sampled in proportion to their weights, and repeats are
+dropped by content hash. De-duplication remembers the last DEDUP_WINDOW
+scenarios only, so an unbounded stream runs in constant memory; streams no
+longer than the window are fully unique.
+
+    from scenario_generator import generate_scenarios
+    for scenario in generate_scenarios(1000, seed=7, weights={"refill": 2, "question": 1}):
+        ...
+"""
+
+import random
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Iterator
+
+from scenarios import PatientScenario, ScenarioType, scenario_id
+
+# =============================================================================
+# Templates
+# =============================================================================
+
+FIRST_NAMES = [
+    "Michael", "Sarah", "Robert", "Jennifer", "David", "Patricia", "James", "Emily",
+    "Thomas", "Maria", "Harold", "Linda", "Kevin", "Aisha", "Daniel", "Grace",
+    "Carlos", "Mei", "Joseph", "Fatima", "Andrew", "Olivia", "Samuel", "Priya",
+    "William", "Nora", "Anthony", "Keisha", "Brian", "Yuki", "George", "Elena",
+]
+LAST_NAMES = [
+    "Thompson", "Chen", "Williams", "Garcia", "Park", "Johnson", "Wilson", "Rodriguez",
+    "Anderson", "Santos", "Miller", "Nguyen", "Patel", "Brown", "Kim", "Okafor",
+    "Martinez", "Davis", "Lopez", "Clark", "Hernandez", "Lewis", "Walker", "Young",
+    "Allen", "Khan", "Scott", "Rivera", "Baker", "Adams", "Nelson", "Cohen",
+]
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+BIRTH_YEARS = (1935, 2005)
+
+SPEAKING_STYLES = [
+    "direct and concise",
+    "polite and chatty",
+    "hesitant, pauses often",
+    "hard of hearing, asks for things to be repeated",
+    "in a hurry",
+    "rambling, unclear",
+    "non-native English speaker, simple sentences",
+]
+
+
+@dataclass(frozen=True)
+class ScenarioTemplate:
+    """Goals and detail value pools for one scenario type."""
+    scenario_type: ScenarioType
+    goals: tuple[str, ...]
+    details: dict[str, tuple[str, ...]]  # Each scenario uses a random subset of keys
+    min_details: int = 1
+
+
+TEMPLATES: list[ScenarioTemplate] = [
+    ScenarioTemplate(
+        scenario_type="scheduling",
+        goals=(
+            "Schedule a new patient appointment for a general checkup",
+            "Schedule an appointment for persistent headaches",
+            "Schedule a follow-up appointment after lab work",
+            "Schedule a physical for a new job",
+            "Schedule an appointment for a lingering cough",
+        ),
+        details={
+            "preferred_time": ("morning", "afternoon", "late afternoon", "first available"),
+            "preferred_day": ("Monday", "Wednesday", "Friday", "any weekday"),
+            "urgency": ("soon as possible", "within two weeks", "no rush"),
+            "new_patient": ("yes", "no"),
+        },
+    ),
+    ScenarioTemplate(
+        scenario_type="rescheduling",
+        goals=(
+            "Reschedule existing appointment to a different day",
+            "Move an appointment to an earlier time",
+            "Reschedule a follow-up to next month",
+        ),
+        details={
+            "current_appointment": (
+                "next Tuesday at 2pm", "this Thursday at 9am", "Monday at 11:30am",
+            ),
+            "reason": ("work conflict", "car trouble", "family event", "travel"),
+            "preferred_time": ("morning", "afternoon", "any time"),
+        },
+    ),
+    ScenarioTemplate(
+        scenario_type="canceling",
+        goals=(
+            "Cancel upcoming appointment",
+            "Cancel an appointment and ask about the cancellation policy",
+        ),
+        details={
+            "reason": ("feeling better", "moving away", "seeing another provider", "cost"),
+            "current_appointment": ("tomorrow at 10am", "next Friday at 3pm"),
+        },
+    ),
+    ScenarioTemplate(
+        scenario_type="refill",
+        goals=(
+            "Request refill for blood pressure medication",
+            "Request refill for allergy medication",
+            "Request refill for diabetes medication",
+            "Ask about a refill that hasn't arrived at the pharmacy",
+        ),
+        details={
+            "medication": (
+                "Lisinopril 10mg", "Zyrtec", "Metformin 500mg", "Atorvastatin 20mg",
+                "Levothyroxine 50mcg",
+            ),
+            "pharmacy": ("CVS", "Walgreens", "Rite Aid", "Walmart Pharmacy"),
+            "days_left": ("none left", "two days", "about a week"),
+        },
+    ),
+    ScenarioTemplate(
+        scenario_type="question",
+        goals=(
+            "Ask about office hours",
+            "Ask about office location",
+            "Ask about insurance",
+            "Ask how to get test results",
+            "Vague request that needs clarification",
+        ),
+        details={
+            "question": (
+                "Are you open on Saturdays?", "What is your address?",
+                "Is there parking?", "Do you offer telehealth visits?",
+            ),
+            "insurance": ("Blue Cross Blue Shield", "Aetna", "Medicare", "Kaiser"),
+        },
+    ),
+]
+
+# A stream stops once this many candidates in a row were duplicates
+MAX_DUPLICATE_STREAK = 1000
+# Content hashes remembered for de-duplication (about 6 MB at 100k)
+DEDUP_WINDOW = 100_000
+
+# =============================================================================
+# Generation
+# =============================================================================
+
+
+def random_dob(rng: random.Random) -> str:
+    """Date of birth in the scenario format, e.g. "January 15, 1980"."""
+    return f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(*BIRTH_YEARS)}"
+
+
+def expand(template: ScenarioTemplate, rng: random.Random) -> PatientScenario:
+    """One random scenario from a template."""
+    keys = sorted(template.details)
+    chosen = rng.sample(keys, rng.randint(template.min_details, len(keys)))
+    details = {key: rng.choice(template.details[key]) for key in sorted(chosen)}
+    details["style"] = rng.choice(SPEAKING_STYLES)
+    return PatientScenario(
+        name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        date_of_birth=random_dob(rng),
+        scenario_type=template.scenario_type,
+        goal=rng.choice(template.goals),
+        details=details,
+    )
+
+
+def generate_scenarios(
+    count: int | None = None,
+    seed: int = 0,
+    weights: dict[str, float] | None = None,
+    templates: list[ScenarioTemplate] = TEMPLATES,
+) -> Iterator[PatientScenario]:
+    """Lazy stream of unique scenarios, `count` of them or unbounded.
+
+    Types are stratified: each next scenario takes the type furthest below
+    its weighted share, so any prefix of the stream matches the weights.
+    The same seed always gives the same stream. Repeats are dropped within
+    the last DEDUP_WINDOW scenarios.
+    """
+    by_type: dict[str, list[ScenarioTemplate]] = {}
+    for template in templates:
+        by_type.setdefault(template.scenario_type, []).append(template)
+
+    weights = {t: w for t, w in (weights or dict.fromkeys(by_type, 1.0)).items() if w > 0}
+    unknown = set(weights) - set(by_type)
+    if unknown:
+        raise ValueError(f"No templates for scenario type(s): {', '.join(sorted(unknown))}")
+    if not weights:
+        raise ValueError("At least one scenario type needs a positive weight")
+    total_weight = sum(weights.values())
+
+    rng = random.Random(seed)
+    emitted: Counter[str] = Counter()
+    seen: set[int] = set()
+    recent: deque[int] = deque()
+    produced = duplicates = 0
+    while count is None or produced < count:
+        target = produced + 1
+        scenario_type = max(weights, key=lambda t: weights[t] / total_weight * target - emitted[t])
+        scenario = expand(rng.choice(by_type[scenario_type]), rng)
+
+        key = int(scenario_id(scenario), 16)
+        if key in seen:
+            duplicates += 1
+            if duplicates >= MAX_DUPLICATE_STREAK:
+                return  # Templates exhausted
+            continue
+        duplicates = 0
+        seen.add(key)
+        recent.append(key)
+        if len(recent) > DEDUP_WINDOW:
+            seen.discard(recent.popleft())
+        emitted[scenario_type] += 1
+        produced += 1
+        yield scenario
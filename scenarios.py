@@ -1,24 +1,117 @@
 """
 Patient test scenarios for the hospital voice bot.
+
+SCENARIOS holds the built-in scenarios below, or, when SCENARIO_CORPUS is
+set, scenarios loaded from JSONL or YAML files (separated by os.pathsep).
+Corpus files are only read on first use. JSONL files are memory-mapped and
+indexed by byte offset, so a scenario is parsed only when it is looked up.
 """
 
+import hashlib
+import json
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Literal
 
 ScenarioType = Literal["scheduling", "rescheduling", "canceling", "refill", "question"]
 
 
-@dataclass
+def _freeze(value):
+    """Interned, hashable form of a detail value: lists become tuples, dicts Details."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, Mapping):
+        return Details(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Inverse of _freeze, back to JSON-ready lists and dicts."""
+    if isinstance(value, Details):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class Details(Mapping):
+    """Immutable, hashable scenario details, stored as a tuple of (key, value) pairs.
+
+    Scenarios have a handful of details, so a linear scan beats a dict here
+    and costs far less memory. String keys and values are interned, and
+    nested lists and dicts are stored as tuples and Details.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Mapping | Iterable[tuple[str, object]] = ()):
+        if isinstance(items, Details):
+            self._items = items._items
+            return
+        if isinstance(items, Mapping):
+            items = items.items()
+        self._items = tuple((_freeze(k), _freeze(v)) for k, v in items)
+
+    def __getitem__(self, key: str):
+        for k, v in self._items:
+            if k == key:
+                return v
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, _ in self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self._items))
+
+    def __repr__(self) -> str:
+        return f"Details({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """Plain dict, with nested values back as lists and dicts."""
+        return {k: _thaw(v) for k, v in self._items}
+
+
+@dataclass(frozen=True, slots=True)
 class PatientScenario:
-    """A patient calling scenario for testing."""
+    """A patient calling scenario for testing.
+
+    Frozen and hashable; `details` is converted to an immutable Details mapping.
+    """
     name: str
     date_of_birth: str  # Format: "January 15, 1980"
     scenario_type: ScenarioType
     goal: str
-    details: dict = field(default_factory=dict)
+    details: Details = field(default_factory=Details)
+
+    def __post_init__(self):
+        object.__setattr__(self, "scenario_type", sys.intern(self.scenario_type))
+        object.__setattr__(self, "goal", sys.intern(self.goal))
+        object.__setattr__(self, "details", Details(self.details))
 
+    def to_dict(self) -> dict:
+        """Plain JSON-ready fields, in the corpus record format."""
+        return {
+            "name": self.name,
+            "date_of_birth": self.date_of_birth,
+            "scenario_type": self.scenario_type,
+            "goal": self.goal,
+            "details": self.details.to_dict(),
+        }
 
-SCENARIOS: list[PatientScenario] = [
+
+BUILTIN_SCENARIOS: list[PatientScenario] = [
     # Scheduling
     PatientScenario(
         name="Michael Thompson",
@@ -105,9 +198,207 @@ SCENARIOS: list[PatientScenario] = [
 ]
 
 
+# =============================================================================
+# Registry
+# =============================================================================
+
+SCENARIO_CORPUS = os.getenv("SCENARIO_CORPUS", "")
+SCENARIO_MMAP = os.getenv("SCENARIO_MMAP", "1") != "0"
+
+
+def scenario_from_dict(record: dict) -> PatientScenario:
+    """Build a scenario from a corpus record; extra keys such as `id` are ignored."""
+    return PatientScenario(
+        name=record["name"],
+        date_of_birth=record["date_of_birth"],
+        scenario_type=record["scenario_type"],
+        goal=record["goal"],
+        details=record.get("details") or {},
+    )
+
+
+def _content_id(name: str, dob: str, scenario_type: str, goal: str, details: dict) -> str:
+    canonical = json.dumps([name, dob, scenario_type, goal, details], sort_keys=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+def scenario_id(scenario: PatientScenario) -> str:
+    """Stable ID derived from the scenario's content."""
+    return _content_id(
+        scenario.name, scenario.date_of_birth, scenario.scenario_type, scenario.goal,
+        scenario.details.to_dict(),
+    )
+
+
+def _record_ids(record: dict) -> tuple[str, ...]:
+    """IDs a record is indexed under: the scenario_id content hash and any explicit `id`."""
+    content = _content_id(
+        record["name"], record["date_of_birth"], record["scenario_type"], record["goal"],
+        record.get("details") or {},
+    )
+    return (content, str(record["id"])) if record.get("id") else (content,)
+
+
+class _ListSource:
+    """Scenarios already in memory."""
+
+    def __init__(self, scenarios: list[PatientScenario]):
+        self.scenarios = scenarios
+
+    def scan(self) -> Iterator[tuple[str, str, tuple[str, ...]]]:
+        for s in self.scenarios:
+            yield s.name, s.scenario_type, (scenario_id(s),)
+
+    def get(self, i: int) -> PatientScenario:
+        return self.scenarios[i]
+
+
+class _JSONLSource:
+    """One scenario per line; records are parsed on demand from their byte offset."""
+
+    def __init__(self, path: Path, use_mmap: bool = SCENARIO_MMAP):
+        self.path = path
+        self.use_mmap = use_mmap
+        self.data: mmap.mmap | bytes = b""
+        self.offsets = array("Q")
+
+    def scan(self) -> Iterator[tuple[str, str, tuple[str, ...]]]:
+        with open(self.path, "rb") as f:
+            if self.use_mmap and os.fstat(f.fileno()).st_size:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = f.read()
+        data, pos, size = self.data, 0, len(self.data)
+        while pos < size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = size
+            line = data[pos:end]
+            if line.strip():
+                record = json.loads(line)
+                self.offsets.append(pos)
+                yield record["name"], record["scenario_type"], _record_ids(record)
+            pos = end + 1
+
+    def get(self, i: int) -> PatientScenario:
+        start = self.offsets[i]
+        end = self.data.find(b"\n", start)
+        return scenario_from_dict(json.loads(self.data[start:end if end != -1 else None]))
+
+
+class _YAMLSource:
+    """A YAML list of scenarios (or a mapping with a `scenarios` list), parsed whole."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.records: list[dict] = []
+
+    def scan(self) -> Iterator[tuple[str, str, tuple[str, ...]]]:
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError(f"PyYAML is needed to load {self.path}: pip install pyyaml") from e
+        with open(self.path) as f:
+            loaded = yaml.safe_load(f) or []
+        self.records = loaded["scenarios"] if isinstance(loaded, dict) else loaded
+        for record in self.records:
+            yield record["name"], record["scenario_type"], _record_ids(record)
+
+    def get(self, i: int) -> PatientScenario:
+        return scenario_from_dict(self.records[i])
+
+
+def _open_source(path: Path):
+    if path.suffix in (".yaml", ".yml"):
+        return _YAMLSource(path)
+    return _JSONLSource(path)
+
+
+class ScenarioRegistry(Sequence):
+    """Scenarios indexed by position, patient name, scenario_type and stable ID.
+
+    Indexes are built on first use, in one pass over the sources.
+    """
+
+    def __init__(self, scenarios: list[PatientScenario] | None = None, paths: list[Path] = ()):
+        self.sources = [_ListSource(scenarios)] if scenarios else []
+        self.sources += [_open_source(Path(p)) for p in paths]
+        self._loaded = False
+
+    def _load(self):
+        self._starts: list[int] = []  # Global index of each source's first scenario
+        self._names: dict[str, int] = {}
+        self._ids: dict[str, int] = {}
+        self._types: dict[str, array] = {}
+        count = 0
+        for source in self.sources:
+            self._starts.append(count)
+            for name, scenario_type, ids in source.scan():
+                self._names.setdefault(name.casefold(), count)
+                for sid in ids:
+                    self._ids.setdefault(sid, count)
+                self._types.setdefault(scenario_type, array("I")).append(count)
+                count += 1
+        self._count = count
+        self._loaded = True
+
+    def __len__(self) -> int:
+        if not self._loaded:
+            self._load()
+        return self._count
+
+    def __getitem__(self, index: int | slice) -> PatientScenario | list[PatientScenario]:
+        if not self._loaded:
+            self._load()
+        if isinstance(index, slice):
+            # A list, as slicing the old SCENARIOS list gave
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("scenario index out of range")
+        source = bisect_right(self._starts, index) - 1
+        return self.sources[source].get(index - self._starts[source])
+
+    def __iter__(self) -> Iterator[PatientScenario]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def index_of(self, sid: str) -> int | None:
+        """Position of the scenario with this stable ID."""
+        if not self._loaded:
+            self._load()
+        return self._ids.get(sid)
+
+    def by_id(self, sid: str) -> PatientScenario | None:
+        index = self.index_of(sid)
+        return None if index is None else self[index]
+
+    def by_name(self, name: str) -> PatientScenario | None:
+        """First scenario for this patient name, ignoring case."""
+        if not self._loaded:
+            self._load()
+        index = self._names.get(name.casefold())
+        return None if index is None else self[index]
+
+    def by_type(self, scenario_type: str) -> Iterator[PatientScenario]:
+        if not self._loaded:
+            self._load()
+        for index in self._types.get(scenario_type, ()):
+            yield self[index]
+
+    def count_of_type(self, scenario_type: str) -> int:
+        if not self._loaded:
+            self._load()
+        return len(self._types.get(scenario_type, ()))
+
+
+if SCENARIO_CORPUS:
+    SCENARIOS = ScenarioRegistry(paths=[Path(p) for p in SCENARIO_CORPUS.split(os.pathsep) if p])
+else:
+    SCENARIOS = ScenarioRegistry(BUILTIN_SCENARIOS)
+
+
 def get_scenario(name: str) -> PatientScenario | None:
     """Find a scenario by patient name."""
-    for s in SCENARIOS:
-        if s.name.lower() == name.lower():
-            return s
-    return None
+    return SCENARIOS.by_name(name)
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the patient bot.
+
+Runs PatientAgent inside a real AgentSession against a scripted hospital IVR.
+The session's audio input and output are an in-process loopback, and
+deterministic stub STT, LLM and TTS stand in for Deepgram and Anthropic, so
+no PSTN calls, API keys or LiveKit server are needed. Everything between the
+plugins runs unchanged: turn detection, the agent's pipeline nodes, the
+hang_up tool, turn timing, transcripts and metrics.
+
+Usage:
+    python simulate.py                          # Every scenario 10 times
+    python simulate.py -c 500 -n 200 --speed 20 # 500 calls, 200 at once, 20x faster
+    python simulate.py -s 0 1 -c 50             # Only scenarios 0 and 1
+    python simulate.py -c 400 -n 200 --max-calls 50  # Saturate a worker capped at 50 calls
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import psutil
+from livekit import rtc
+from livekit.agents import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions, AgentSession
+from livekit.agents import llm, stt, tts, utils
+from livekit.agents.voice import io
+
+# Stub replies and silent audio must never reach the shared LLM and TTS caches, and
+# simulated calls must not show up in the dispatcher's call events
+os.environ["LLM_CACHE_MODE"] = "passthrough"
+os.environ["TTS_CACHE"] = "0"
+os.environ["CALL_EVENTS_PATH"] = os.devnull
+
+from agent import (  # noqa: E402
+    OPENING_INSTRUCTIONS,
+    CallRecorder,
+    PatientAgent,
+    WorkerCapacity,
+    patient_prompt,
+)
+from latency import format_table  # noqa: E402
+from scenarios import PatientScenario, SCENARIOS  # noqa: E402
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+# Stub timings in seconds, before --speed is applied
+IVR_CHARS_PER_SEC = 15  # Hospital prompt playout
+STT_ENDPOINT_DELAY = 0.3  # End of speech to final transcript
+LLM_FIRST_TOKEN = 0.4
+LLM_TOKEN_INTERVAL = 0.015
+TTS_FIRST_BYTE = 0.15
+TTS_SECONDS_PER_CHAR = 0.06  # ~15 characters of speech per second
+JITTER = 0.2  # +/- fraction applied to every delay
+TURN_TIMEOUT = 30.0  # A patient turn that takes longer ends the call
+
+SAMPLE_RATE = 24000
+FRAME_MS = 20
+LAG_PROBE_INTERVAL = 0.01
+
+# Worker admission, in simulated seconds
+LOAD_UPDATE_INTERVAL = 2.5  # How often the worker reports its load
+REOFFER_DELAY = 1.0  # A declined call is offered again after this long
+
+# Scripted hospital IVR, one prompt per turn
+IVR_SCRIPT = [
+    "Thank you for calling. This call may be recorded for quality and training purposes.",
+    "Am I speaking with {first_name}?",
+    "Can I have your date of birth?",
+    "How can I help you today?",
+    "Okay, I've made a note of that. Is there anything else I can help you with?",
+]
+
+# =============================================================================
+# Phone Line
+# =============================================================================
+
+
+class Clock:
+    """Scaled, jittered delays for one simulated call."""
+
+    def __init__(self, speed: float, seed: int):
+        self.speed = speed
+        self.rng = random.Random(seed)
+
+    async def sleep(self, seconds: float):
+        jitter = 1 + self.rng.uniform(-JITTER, JITTER)
+        await asyncio.sleep(seconds * jitter / self.speed)
+
+
+class PhoneLine:
+    """Both directions of a simulated call.
+
+    The hospital's audio feeds the session's audio input, and what it says
+    goes to the stub STT, which has no audio to recognize. The patient's
+    audio plays out through LoopbackOutput, which reports each finished turn.
+    """
+
+    def __init__(self):
+        self.audio: asyncio.Queue[rtc.AudioFrame] = asyncio.Queue()
+        self.speech: asyncio.Queue[str | None] = asyncio.Queue()  # None starts an utterance
+        self.played: asyncio.Queue[float] = asyncio.Queue()  # Seconds of each patient turn
+        self.hung_up = asyncio.Event()
+
+    async def hospital_say(self, text: str, clock: Clock):
+        """Speak `text` into the line in real time, then hand its transcript to the STT."""
+        self.speech.put_nowait(None)
+        samples = SAMPLE_RATE * FRAME_MS // 1000
+        for _ in range(round(len(text) / IVR_CHARS_PER_SEC * 1000 / FRAME_MS)):
+            self.audio.put_nowait(rtc.AudioFrame.create(SAMPLE_RATE, 1, samples))
+            await clock.sleep(FRAME_MS / 1000)
+        self.speech.put_nowait(text)
+
+    async def patient_turn(self, timeout: float) -> bool:
+        """Wait for the patient to finish speaking. False once they hang up or go quiet."""
+        played = asyncio.ensure_future(self.played.get())
+        hung_up = asyncio.ensure_future(self.hung_up.wait())
+        await asyncio.wait({played, hung_up}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        played.cancel()
+        hung_up.cancel()
+        return played.done() and not played.cancelled() and not self.hung_up.is_set()
+
+
+class LoopbackInput(io.AudioInput):
+    """Session audio input carrying the hospital's side of the line."""
+
+    def __init__(self, line: PhoneLine):
+        super().__init__(label="Loopback")
+        self.line = line
+
+    async def __anext__(self) -> rtc.AudioFrame:
+        return await self.line.audio.get()
+
+
+class LoopbackOutput(io.AudioOutput):
+    """Session audio output that plays the patient's turns to the hospital.
+
+    Frames arrive faster than real time; a turn finishes playing once its
+    duration, compressed by `speed`, has passed since its first frame.
+    """
+
+    def __init__(self, line: PhoneLine, speed: float):
+        super().__init__(label="Loopback", capabilities=io.AudioOutputCapabilities(pause=False))
+        self.line = line
+        self.speed = speed
+        self._started: float | None = None  # Monotonic time of the turn's first frame
+        self._pushed = 0.0  # Seconds of audio in the turn
+        self._playout: asyncio.Task | None = None
+
+    async def capture_frame(self, frame: rtc.AudioFrame):
+        await super().capture_frame(frame)
+        if self._started is None:
+            self._started = time.monotonic()
+            self.on_playback_started(created_at=time.time())
+        self._pushed += frame.duration
+
+    def flush(self):
+        super().flush()
+        if self._started is None:
+            return
+        self._playout = asyncio.create_task(self._play(self._started, self._pushed))
+        self._started, self._pushed = None, 0.0
+
+    def clear_buffer(self):
+        if self._playout and not self._playout.done():
+            self._playout.cancel()
+        elif self._started is not None:
+            # Cleared before it was flushed
+            played = min(self._pushed, (time.monotonic() - self._started) * self.speed)
+            self._started, self._pushed = None, 0.0
+            self.on_playback_finished(playback_position=played, interrupted=True)
+
+    async def _play(self, started: float, duration: float):
+        try:
+            await asyncio.sleep(max(0.0, started + duration / self.speed - time.monotonic()))
+        except asyncio.CancelledError:
+            played = min(duration, (time.monotonic() - started) * self.speed)
+            self.on_playback_finished(playback_position=played, interrupted=True)
+            raise
+        self.on_playback_finished(playback_position=duration, interrupted=False)
+        self.line.played.put_nowait(duration)
+
+
+# =============================================================================
+# Stub Backends
+# =============================================================================
+
+
+def patient_reply(scenario: PatientScenario, prompt: str | None) -> tuple[str, bool]:
+    """Deterministic patient reply to a hospital prompt. Returns (text, hang up)."""
+    goal = scenario.goal[0].lower() + scenario.goal[1:]
+    prompt = (prompt or "").lower()
+
+    if not prompt:
+        return f"Hi, I'm calling to {goal}.", False
+    if "speaking with" in prompt:
+        return f"Yes, this is {scenario.name}.", False
+    if "date of birth" in prompt:
+        return f"My date of birth is {scenario.date_of_birth}.", False
+    if "help you today" in prompt:
+        return f"I'd like to {goal}.", False
+    if "anything else" in prompt:
+        return "No, that's everything. Thank you, goodbye.", True
+    return "Okay.", False
+
+
+class StubSTT(stt.STT):
+    """Streaming STT that reports what the hospital said on the line."""
+
+    def __init__(self, line: PhoneLine, clock: Clock):
+        super().__init__(capabilities=stt.STTCapabilities(streaming=True, interim_results=False))
+        self.line = line
+        self.clock = clock
+
+    async def _recognize_impl(self, buffer, *, language=None, conn_options=None):
+        raise NotImplementedError("StubSTT only streams")
+
+    def stream(
+        self, *, language=None, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> "StubRecognizeStream":
+        return StubRecognizeStream(stt=self, conn_options=conn_options)
+
+
+class StubRecognizeStream(stt.RecognizeStream):
+    async def _run(self):
+        drain = asyncio.create_task(self._drain_audio())
+        try:
+            while True:
+                text = await self._stt.line.speech.get()
+                if text is None:
+                    self._event_ch.send_nowait(
+                        stt.SpeechEvent(type=stt.SpeechEventType.START_OF_SPEECH)
+                    )
+                    continue
+                await self._stt.clock.sleep(STT_ENDPOINT_DELAY)
+                self._event_ch.send_nowait(
+                    stt.SpeechEvent(
+                        type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+                        alternatives=[stt.SpeechData(language="en", text=text, confidence=1.0)],
+                    )
+                )
+                self._event_ch.send_nowait(stt.SpeechEvent(type=stt.SpeechEventType.END_OF_SPEECH))
+        finally:
+            drain.cancel()
+
+    async def _drain_audio(self):
+        # The transcript comes from the line; the audio only has to be consumed
+        async for _ in self._input_ch:
+            pass
+
+
+class StubLLM(llm.LLM):
+    """Answers the latest hospital prompt with patient_reply, streamed word by word."""
+
+    def __init__(self, scenario: PatientScenario, clock: Clock):
+        super().__init__()
+        self.scenario = scenario
+        self.clock = clock
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools: list | None = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        **kwargs,
+    ) -> "StubLLMStream":
+        return StubLLMStream(self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class StubLLMStream(llm.LLMStream):
+    async def _run(self):
+        # Nothing more to say once the hang_up tool has run
+        item = self._chat_ctx.items[-1] if self._chat_ctx.items else None
+        if item is None or item.type != "message" or item.role != "user":
+            return
+        prompt = item.text_content
+        text, hang_up = patient_reply(
+            self._llm.scenario, None if prompt == OPENING_INSTRUCTIONS else prompt
+        )
+
+        request_id = utils.shortuuid()
+        await self._llm.clock.sleep(LLM_FIRST_TOKEN)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            content = word if i == len(words) - 1 else word + " "
+            delta = llm.ChoiceDelta(role="assistant", content=content)
+            self._event_ch.send_nowait(llm.ChatChunk(id=request_id, delta=delta))
+            await self._llm.clock.sleep(LLM_TOKEN_INTERVAL)
+        if hang_up:
+            call = llm.FunctionToolCall(name="hang_up", arguments="{}", call_id=request_id)
+            delta = llm.ChoiceDelta(role="assistant", tool_calls=[call])
+            self._event_ch.send_nowait(llm.ChatChunk(id=request_id, delta=delta))
+
+
+class StubTTS(tts.TTS):
+    """Non-streaming TTS producing silence as long as the text would take to speak."""
+
+    def __init__(self, clock: Clock):
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=False),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+        )
+        self.clock = clock
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> "StubChunkedStream":
+        return StubChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class StubChunkedStream(tts.ChunkedStream):
+    async def _run(self, output_emitter: tts.AudioEmitter):
+        output_emitter.initialize(
+            request_id=utils.shortuuid(), sample_rate=SAMPLE_RATE, num_channels=1,
+            mime_type="audio/pcm",
+        )
+        await self._tts.clock.sleep(TTS_FIRST_BYTE)
+        samples = round(len(self._input_text) * TTS_SECONDS_PER_CHAR * SAMPLE_RATE)
+        output_emitter.push(bytes(2 * samples))
+        output_emitter.flush()
+
+
+# =============================================================================
+# Simulated Call
+# =============================================================================
+
+
+async def simulate_call(
+    scenario: PatientScenario, call_num: int, out_dir: Path, speed: float, seed: int
+) -> CallRecorder:
+    """Simulate one outbound call from answer to hang-up."""
+    clock = Clock(speed, seed + call_num)
+    line = PhoneLine()
+    recorder = CallRecorder(
+        scenario.name, f"sim-{call_num}", transcripts_dir=out_dir, recordings_dir=out_dir,
+        prompt_fingerprint=patient_prompt(scenario).fingerprint,
+    )
+    agent = PatientAgent(scenario, recorder)
+    session = AgentSession(
+        stt=StubSTT(line, clock),
+        llm=StubLLM(scenario, clock),
+        tts=StubTTS(clock),
+        vad=None,
+        turn_detection="stt",
+        min_endpointing_delay=0.0,
+        allow_interruptions=False,
+    )
+    session.input.audio = LoopbackInput(line)
+    session.output.audio = LoopbackOutput(line, speed)
+
+    @session.on("user_input_transcribed")
+    def on_hospital_speech(event):
+        if event.is_final:
+            agent.on_hospital_final(event.transcript)
+
+    @session.on("function_tools_executed")
+    def on_tools(event):
+        if any(call.name == "hang_up" for call in event.function_calls):
+            line.hung_up.set()
+
+    await session.start(agent)
+    try:
+        # The opening line is prepared while the phone rings
+        text, frames = await agent.prepare_opening()
+        agent.play_opening(text, frames, answered_at=time.monotonic())
+
+        first_name = scenario.name.split()[0]
+        for prompt in IVR_SCRIPT:
+            if not await line.patient_turn(TURN_TIMEOUT / speed):
+                break
+            await line.hospital_say(prompt.format(first_name=first_name), clock)
+        else:
+            await line.patient_turn(TURN_TIMEOUT / speed)
+            # The goodbye has played; give the hang_up tool its turn
+            try:
+                await asyncio.wait_for(line.hung_up.wait(), TURN_TIMEOUT / speed)
+            except asyncio.TimeoutError:
+                pass
+        if not line.hung_up.is_set():
+            recorder.end_reason = "timeout"
+    finally:
+        await session.aclose()
+        await recorder.finalize()
+    return recorder
+
+
+# =============================================================================
+# Load Test
+# =============================================================================
+
+
+def rss_mb() -> float:
+    """Peak resident memory of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def probe_lag(samples: list[float], stop: asyncio.Event):
+    """Record how far past its deadline each event-loop wake-up lands."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(time.perf_counter() - start - LAG_PROBE_INTERVAL)
+
+
+async def report_load(
+    capacity: WorkerCapacity, running: set[str], lag: list[float], speed: float,
+    stop: asyncio.Event,
+):
+    """Refresh the worker's load periodically, as LiveKit's load_fnc polling does."""
+    process = psutil.Process()
+    process.cpu_percent()
+    while not stop.is_set():
+        await asyncio.sleep(LOAD_UPDATE_INTERVAL / speed)
+        recent_lag = max(lag[-50:], default=0.0)
+        # The simulation is one event loop, so one busy core means saturation
+        capacity.update(list(running), process.cpu_percent() / 100, recent_lag)
+
+
+async def run_load_test(
+    indices: list[int],
+    calls: int,
+    concurrency: int,
+    speed: float,
+    seed: int,
+    out_dir: Path,
+    max_calls: int | None = None,
+):
+    """Run `calls` simulated calls, at most `concurrency` offered at once, and report.
+
+    With `max_calls`, the calls are offered to a worker that admits them through
+    WorkerCapacity; declined calls are offered again after REOFFER_DELAY.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    capacity = WorkerCapacity(max_calls) if max_calls else None
+    lag: list[float] = []
+    stop = asyncio.Event()
+    running: set[str] = set()  # Job ids of calls in progress
+    peak_active = 0
+    admission_waits: list[float] = []
+
+    async def run_one(call_num: int) -> CallRecorder:
+        nonlocal peak_active
+        job_id = f"sim-{call_num}"
+        async with slots:
+            offered = time.monotonic()
+            while capacity and not capacity.try_admit(job_id):
+                await asyncio.sleep(REOFFER_DELAY / speed)
+            admission_waits.append((time.monotonic() - offered) * speed)
+            running.add(job_id)
+            peak_active = max(peak_active, len(running))
+            try:
+                scenario = SCENARIOS[indices[call_num % len(indices)]]
+                return await simulate_call(scenario, call_num, out_dir, speed, seed)
+            finally:
+                running.discard(job_id)
+
+    baseline = rss_mb()
+    probes = [asyncio.create_task(probe_lag(lag, stop))]
+    if capacity:
+        probes.append(
+            asyncio.create_task(report_load(capacity, running, lag, speed, stop))
+        )
+    start = time.monotonic()
+    recorders = await asyncio.gather(*(run_one(n) for n in range(calls)))
+    elapsed = time.monotonic() - start
+    stop.set()
+    await asyncio.gather(*probes)
+
+    latencies: dict[str, list[float]] = {}
+    for recorder in recorders:
+        for stage, values in recorder.latencies.items():
+            # Stub delays are compressed by --speed; report simulated time, like admission waits
+            latencies.setdefault(stage, []).extend(v * speed for v in values)
+
+    lag_ms = sorted(x * 1000 for x in lag)
+    per_call_mb = (rss_mb() - baseline) / max(1, peak_active)
+
+    print(f"\n{'=' * 50}")
+    print(f"Calls: {calls} ({peak_active} concurrent peak), speed {speed:g}x")
+    print(f"Wall clock: {elapsed:.1f}s ({calls / elapsed:.2f} calls/sec)")
+    if capacity:
+        waits = sorted(admission_waits)
+        print(
+            f"Admission: capped at {capacity.max_calls} calls, {capacity.declined} offers "
+            f"declined, wait p50 {waits[len(waits) // 2]:.1f}s max {waits[-1]:.1f}s (simulated)"
+        )
+    print(f"Memory: {per_call_mb * 1024:.0f} KB per concurrent call (peak RSS {rss_mb():.0f} MB)")
+    print(
+        f"Event-loop lag: p50 {lag_ms[len(lag_ms) // 2]:.1f}ms, "
+        f"p99 {lag_ms[int(len(lag_ms) * 0.99) - 1]:.1f}ms, max {lag_ms[-1]:.1f}ms"
+    )
+    print(f"Turn latency in simulated time (wall clock x{speed:g})")
+    print("\n".join(format_table(latencies)))
+    print(f"{'=' * 50}")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline load test with a simulated hospital IVR",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("-s", "--scenario", type=int, nargs="+", help="Scenario indices to run")
+    parser.add_argument("-c", "--calls", type=int, help="Total calls (default: 10 per scenario)")
+    parser.add_argument("-n", "--concurrency", type=int, default=50, help="Calls at once")
+    parser.add_argument(
+        "--max-calls", type=int, help="Worker call cap; offers beyond it are declined and retried"
+    )
+    parser.add_argument("--speed", type=float, default=10.0, help="Time compression factor")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for stub timing jitter")
+    parser.add_argument("--out", type=Path, help="Keep transcripts in this directory")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every utterance")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger("patient-bot").setLevel(logging.WARNING)
+        # Per-session notices about the stub setup would repeat for every call
+        logging.getLogger("livekit.agents").setLevel(logging.ERROR)
+
+    indices = args.scenario if args.scenario else list(range(len(SCENARIOS)))
+    for idx in indices:
+        if idx < 0 or idx >= len(SCENARIOS):
+            print(f"ERROR: Invalid scenario index: {idx}")
+            sys.exit(1)
+    calls = args.calls or 10 * len(indices)
+
+    print("Hospital Voice Bot - Offline Simulation")
+    print(f"Scenarios: {len(indices)}, calls: {calls}, concurrency: {args.concurrency}")
+
+    if args.out:
+        args.out.mkdir(parents=True, exist_ok=True)
+        asyncio.run(
+            run_load_test(
+                indices, calls, args.concurrency, args.speed, args.seed, args.out, args.max_calls
+            )
+        )
+        return
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        asyncio.run(
+            run_load_test(
+                indices, calls, args.concurrency, args.speed, args.seed, Path(out_dir),
+                args.max_calls,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
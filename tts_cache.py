@@ -0,0 +1,222 @@
+"""
+On-disk cache of synthesized patient speech.
+
+Reply text is split into sentences. Each sentence is keyed on
+(TTS model, normalized text) and stored as raw PCM. A cached sentence is
+streamed straight back from disk. On a miss, the rest of the reply goes to
+the streaming TTS, and its audio is stored if that rest was one sentence.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable
+
+from livekit import rtc
+from livekit.agents import tts
+
+from cache_store import DiskLRUStore
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+CACHE_DIR = Path(os.getenv("CACHE_DIR", Path(__file__).parent / "cache"))
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE", "1") != "0"
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "256"))
+
+FRAME_MS = 20  # Frame size when streaming cached audio
+HEADER = struct.Struct("<IH")  # sample_rate, num_channels
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class CacheStats:
+    """Sentence-level hit/miss counts."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace; case and punctuation are kept since they change prosody."""
+    return " ".join(text.split())
+
+
+async def split_sentences(text: AsyncIterable[str]) -> AsyncIterable[str]:
+    """Re-chunk a text stream into whole sentences."""
+    buffer = ""
+    async for chunk in text:
+        buffer += chunk
+        *sentences, buffer = SENTENCE_END.split(buffer)
+        for sentence in sentences:
+            if sentence.strip():
+                yield sentence
+    if buffer.strip():
+        yield buffer
+
+
+def encode_frames(frames: list[rtc.AudioFrame]) -> bytes:
+    first = frames[0]
+    return HEADER.pack(first.sample_rate, first.num_channels) + b"".join(
+        bytes(frame.data) for frame in frames
+    )
+
+
+def decode_frames(data: bytes) -> list[rtc.AudioFrame]:
+    sample_rate, num_channels = HEADER.unpack_from(data)
+    pcm = memoryview(data)[HEADER.size:]
+    samples = sample_rate * FRAME_MS // 1000
+    step = samples * num_channels * 2  # 16-bit PCM
+    frames = []
+    for offset in range(0, len(pcm), step):
+        chunk = pcm[offset:offset + step]
+        frames.append(
+            rtc.AudioFrame(
+                data=chunk,
+                sample_rate=sample_rate,
+                num_channels=num_channels,
+                samples_per_channel=len(chunk) // (2 * num_channels),
+            )
+        )
+    return frames
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class TTSCache:
+    """Sentence-level TTS cache in front of any LiveKit TTS."""
+
+    def __init__(self, model: str, store: DiskLRUStore | None = None):
+        self.model = model
+        if store is None:
+            store = DiskLRUStore(CACHE_DIR / "tts", TTS_CACHE_MAX_MB * 1024 * 1024)
+        self.store = store
+        self.stats = CacheStats()  # Totals for this process
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{normalize_text(text)}".encode()).hexdigest()
+
+    def _count(self, stats: CacheStats, hits: int = 0, misses: int = 0):
+        stats.hits += hits
+        stats.misses += misses
+        self.stats.hits += hits
+        self.stats.misses += misses
+
+    async def synthesize(
+        self,
+        text: AsyncIterable[str],
+        engine: tts.TTS,
+        stats: CacheStats,
+        stream: Callable[[AsyncIterable[str]], AsyncIterable[rtc.AudioFrame]] | None = None,
+    ) -> AsyncIterable[rtc.AudioFrame]:
+        """Audio for a text stream, served from cache where possible.
+
+        With `stream` (e.g. the agent's default tts_node), the first miss hands
+        the rest of the reply to it, so uncached speech keeps streaming TTS
+        latency. Without it, each missed sentence is synthesized on its own.
+        """
+        if stream:
+            async for frame in self._synthesize_streaming(text, stats, stream):
+                yield frame
+            return
+
+        async for sentence in split_sentences(text):
+            key = self.key(sentence)
+            cached = await asyncio.to_thread(self.store.get, key)
+            if cached:
+                self._count(stats, hits=1)
+                for frame in decode_frames(cached):
+                    yield frame
+                continue
+
+            self._count(stats, misses=1)
+            frames: list[rtc.AudioFrame] = []
+            async with engine.synthesize(sentence) as synthesis:
+                async for audio in synthesis:
+                    frames.append(audio.frame)
+                    yield audio.frame
+
+            # Interrupted sentences never get here, so only complete audio is stored
+            if frames:
+                await asyncio.to_thread(self.store.put, key, encode_frames(frames))
+
+    async def _synthesize_streaming(
+        self,
+        text: AsyncIterable[str],
+        stats: CacheStats,
+        stream: Callable[[AsyncIterable[str]], AsyncIterable[rtc.AudioFrame]],
+    ) -> AsyncIterable[rtc.AudioFrame]:
+        """Serve leading cached sentences, then stream the rest of the text as it came."""
+        chunks = aiter(text)
+        buffer = ""
+        done = False
+        while not done:
+            chunk = await anext(chunks, None)
+            done = chunk is None
+            buffer += chunk or ""
+            while True:
+                # A sentence is complete at whitespace after .!? or at the end of the text
+                match = SENTENCE_END.search(buffer)
+                if match:
+                    sentence, next_start = buffer[:match.start()], match.end()
+                elif done and buffer.strip():
+                    sentence, next_start = buffer, len(buffer)
+                else:
+                    break
+                cached = await asyncio.to_thread(self.store.get, self.key(sentence))
+                if not cached:
+                    async for frame in self._stream_rest(buffer, chunks, stats, stream):
+                        yield frame
+                    return
+                self._count(stats, hits=1)
+                for frame in decode_frames(cached):
+                    yield frame
+                buffer = buffer[next_start:]
+
+    async def _stream_rest(
+        self,
+        buffer: str,
+        chunks: AsyncIterator[str],
+        stats: CacheStats,
+        stream: Callable[[AsyncIterable[str]], AsyncIterable[rtc.AudioFrame]],
+    ) -> AsyncIterable[rtc.AudioFrame]:
+        """Stream the unmodified remaining text, from the first missed sentence on."""
+        self._count(stats, misses=1)
+        spoken = [buffer]
+
+        async def rest() -> AsyncIterable[str]:
+            yield buffer
+            async for chunk in chunks:
+                spoken.append(chunk)
+                yield chunk
+
+        frames: list[rtc.AudioFrame] = []
+        async for frame in stream(rest()):
+            frames.append(frame)
+            yield frame
+
+        # Sentences after the first miss were never looked up; they count as misses.
+        # Audio can only be stored per sentence when the rest was a single sentence.
+        sentences = [s for s in SENTENCE_END.split("".join(spoken)) if s.strip()]
+        self._count(stats, misses=len(sentences) - 1)
+        if frames and len(sentences) == 1:
+            await asyncio.to_thread(
+                self.store.put, self.key(sentences[0]), encode_frames(frames)
+            )
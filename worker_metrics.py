@@ -0,0 +1,394 @@
+"""
+Prometheus-style metrics for the agent worker.
+
+LiveKit runs each job in its own process, so every job process writes a
+snapshot of its metrics to METRICS_DIR about once a second, and once more
+when its job shuts down. The main worker process serves GET /metrics by
+merging the live snapshots with its own. When a job process exits, its
+counters and histograms are folded into a running total kept by the main
+process, so they never go backwards; its gauges are dropped.
+
+    curl localhost:9464/metrics
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger("patient-bot")
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))  # 0 disables the endpoint
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_DIR = Path(os.getenv("METRICS_DIR", Path(tempfile.gettempdir()) / "patient-bot-metrics"))
+SNAPSHOT_INTERVAL = 1.0  # Seconds between job-process snapshots
+LOOP_LAG_INTERVAL = 0.5  # Seconds between event-loop lag probes
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LATENCY_MS_BUCKETS = (100, 250, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+
+def _label_key(labels: dict[str, str]) -> str:
+    return ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+
+
+class Metric:
+    """Base for a named metric with optional labels."""
+
+    type = ""
+
+    def __init__(self, registry: "Registry", name: str, help: str):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.values: dict[str, float] = {}
+
+    def snapshot(self) -> dict:
+        return {"type": self.type, "help": self.help, "values": dict(self.values)}
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = _label_key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Gauge; values from different processes merge by `sum` or `max`."""
+
+    type = "gauge"
+
+    def __init__(self, registry: "Registry", name: str, help: str, merge: str = "sum"):
+        super().__init__(registry, name, help)
+        self.merge = merge
+
+    def set(self, value: float, **labels: str):
+        with self.registry.lock:
+            self.values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = _label_key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "merge": self.merge}
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, registry: "Registry", name: str, help: str, buckets: tuple):
+        super().__init__(registry, name, help)
+        self.buckets = buckets
+        self.series: dict[str, dict] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = _label_key(labels)
+        with self.registry.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {
+                    "counts": [0] * len(self.buckets), "sum": 0.0, "count": 0,
+                }
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "type": self.type,
+            "help": self.help,
+            "buckets": list(self.buckets),
+            "series": {k: {**v, "counts": list(v["counts"])} for k, v in self.series.items()},
+        }
+
+
+class Registry:
+    """A process's metrics."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._add(Counter(self, name, help))
+
+    def gauge(self, name: str, help: str, merge: str = "sum") -> Gauge:
+        return self._add(Gauge(self, name, help, merge))
+
+    def histogram(self, name: str, help: str, buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(self, name, help, buckets))
+
+    def _add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+
+REGISTRY = Registry()
+
+# Calls
+ACTIVE_CALLS = REGISTRY.gauge("patient_bot_active_calls", "Calls currently in progress")
+CALLS_STARTED = REGISTRY.counter("patient_bot_calls_started_total", "Jobs started")
+CALLS_FAILED = REGISTRY.counter("patient_bot_calls_failed_total", "Calls that failed, by reason")
+SIP_CONNECT_TIME = REGISTRY.histogram(
+    "patient_bot_sip_connect_seconds", "Time from dialing to the call being answered"
+)
+ANSWER_TO_AUDIO = REGISTRY.histogram(
+    "patient_bot_answer_to_first_audio_seconds", "Time from the call being answered to our first audio"
+)
+WATCHDOG_ENDS = REGISTRY.counter(
+    "patient_bot_watchdog_ends_total", "Calls ended by the watchdog, by reason"
+)
+EGRESS_FAILURES = REGISTRY.counter(
+    "patient_bot_egress_start_failures_total", "Recordings that failed to start"
+)
+
+# Pipeline
+TURN_LATENCY = REGISTRY.histogram(
+    "patient_bot_turn_latency_ms", "Per-turn latency by pipeline stage", LATENCY_MS_BUCKETS
+)
+LLM_TOKENS = REGISTRY.counter("patient_bot_llm_tokens_total", "LLM tokens, by direction")
+LLM_CACHED_TOKENS = REGISTRY.counter(
+    "patient_bot_llm_cached_tokens_total", "Prompt tokens served from the Anthropic prompt cache"
+)
+LLM_TTFT = REGISTRY.histogram("patient_bot_llm_ttft_seconds", "LLM time to first token")
+TTS_CHARACTERS = REGISTRY.counter("patient_bot_tts_characters_total", "Characters synthesized")
+TTS_CACHE = REGISTRY.counter("patient_bot_tts_cache_total", "TTS cache lookups, by result")
+
+# Event loop
+LOOP_LAG = REGISTRY.histogram(
+    "patient_bot_event_loop_lag_seconds", "How late event-loop wake-ups land", LOOP_LAG_BUCKETS
+)
+LOOP_LAG_MAX = REGISTRY.gauge(
+    "patient_bot_event_loop_lag_max_seconds", "Worst recent event-loop lag", merge="max"
+)
+
+# =============================================================================
+# Job Processes
+# =============================================================================
+
+_snapshot_thread: threading.Thread | None = None
+_watched_loops: set[int] = set()
+
+
+def start_snapshots():
+    """Write this process's metrics to METRICS_DIR periodically (job processes)."""
+    global _snapshot_thread
+    if _snapshot_thread or not METRICS_PORT:
+        return
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    _snapshot_thread = threading.Thread(target=_snapshot_loop, name="metrics", daemon=True)
+    _snapshot_thread.start()
+
+
+def write_snapshot():
+    """Write this process's metrics now, e.g. from a job's shutdown callback."""
+    if not _snapshot_thread:
+        return
+    path = METRICS_DIR / f"{os.getpid()}.json"
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(json.dumps(REGISTRY.snapshot()))
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics snapshot: {e}")
+
+
+def _snapshot_loop():
+    while True:
+        write_snapshot()
+        time.sleep(SNAPSHOT_INTERVAL)
+
+
+def watch_event_loop():
+    """Start the lag probe on the running event loop, once per loop."""
+    loop = asyncio.get_running_loop()
+    if id(loop) in _watched_loops:
+        return
+    _watched_loops.add(id(loop))
+    loop.create_task(_probe_loop_lag())
+
+
+async def _probe_loop_lag():
+    worst = 0.0
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lag = max(0.0, time.perf_counter() - start - LOOP_LAG_INTERVAL)
+        LOOP_LAG.observe(lag)
+        # Decay so the gauge tracks recent lag, not the all-time worst
+        worst = max(lag, worst * 0.9)
+        LOOP_LAG_MAX.set(worst)
+
+
+# =============================================================================
+# Exposition (main worker process)
+# =============================================================================
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Counters and histograms of job processes that have exited
+_retired: dict[str, dict] = {}
+_retired_lock = threading.Lock()
+
+
+def _retire(path: Path):
+    """Fold an exited process's counters and histograms into _retired, then delete it."""
+    global _retired
+    with _retired_lock:
+        try:
+            snapshot = json.loads(path.read_text())
+        except FileNotFoundError:
+            return  # Another request retired it first
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Dropping unreadable metrics snapshot {path.name}: {e}")
+            snapshot = {}
+        kept = {name: metric for name, metric in snapshot.items() if metric["type"] != "gauge"}
+        _retired = merge_snapshots([_retired, kept])
+        path.unlink(missing_ok=True)
+
+
+def collect_snapshots() -> list[dict]:
+    """This process's snapshot, those of live job processes, and exited ones' totals."""
+    snapshots = [REGISTRY.snapshot()]
+    for path in METRICS_DIR.glob("*.json"):
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            continue
+        if not _pid_alive(pid):
+            _retire(path)
+            continue
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, json.JSONDecodeError):
+            continue
+    with _retired_lock:
+        snapshots.append(_retired)
+    return snapshots
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """Merge per-process snapshots into one."""
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            into = merged.setdefault(name, {**metric, "values": {}, "series": {}})
+            for key, value in metric.get("values", {}).items():
+                if key in into["values"] and metric.get("merge") == "max":
+                    into["values"][key] = max(into["values"][key], value)
+                else:
+                    into["values"][key] = into["values"].get(key, 0) + value
+            for key, series in metric.get("series", {}).items():
+                total = into["series"].setdefault(
+                    key, {"counts": [0] * len(metric["buckets"]), "sum": 0.0, "count": 0}
+                )
+                total["counts"] = [a + b for a, b in zip(total["counts"], series["counts"])]
+                total["sum"] += series["sum"]
+                total["count"] += series["count"]
+    return merged
+
+
+def gauge_value(name: str) -> float:
+    """Merged value of an unlabelled gauge across this process and live job processes."""
+    metric = merge_snapshots(collect_snapshots()).get(name)
+    return metric["values"].get("", 0.0) if metric else 0.0
+
+
+def render(merged: dict) -> str:
+    """Prometheus text exposition format."""
+    lines = []
+    for name, metric in sorted(merged.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+
+        if metric["type"] != "histogram":
+            for key, value in sorted(metric["values"].items()):
+                lines.append(f"{name}{{{key}}} {value:g}" if key else f"{name} {value:g}")
+            continue
+
+        for key, series in sorted(metric["series"].items()):
+            sep = "," if key else ""
+            cumulative = 0
+            for bound, count in zip(metric["buckets"], series["counts"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{key}{sep}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{key}{sep}le="+Inf"}} {series["count"]}')
+            labels = f"{{{key}}}" if key else ""
+            lines.append(f"{name}_sum{labels} {series['sum']:g}")
+            lines.append(f"{name}_count{labels} {series['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("/metrics", ""):
+            self.send_error(404)
+            return
+        body = render(merge_snapshots(collect_snapshots())).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = METRICS_PORT, host: str = METRICS_HOST) -> ThreadingHTTPServer | None:
+    """Serve merged metrics on `host`:`port` from a background thread."""
+    if not port:
+        return None
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    # Snapshots left by a previous worker's jobs don't belong to this one's totals
+    for path in METRICS_DIR.glob("*.json"):
+        if path.stem.isdigit() and not _pid_alive(int(path.stem)):
+            path.unlink(missing_ok=True)
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint disabled, could not bind {host}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrics: http://{host}:{port}/metrics")
+    return server